@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Compare the entry codecs: encoded size, database file size and decode time.
+
+Usage:
+    $ python benchmarks/bench_codec.py
+    $ python benchmarks/bench_codec.py --words 100000
+"""
+
+import argparse
+import tempfile
+import timeit
+from json import loads
+from pathlib import Path
+
+from bench_memory import synthetic_corpus
+
+from english_dictionary.codec import BinaryCodec, JsonCodec, decode_entry
+from english_dictionary.database import Database
+
+CODECS = {
+    "json": JsonCodec(),
+    "binary": BinaryCodec(),
+    "binary+zlib1": BinaryCodec(compression_level=1),
+    "binary+zlib6": BinaryCodec(compression_level=6),
+    "binary+zlib9": BinaryCodec(compression_level=9),
+}
+
+REPEAT = 10
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=20_000)
+    args = parser.parse_args()
+
+    words = [loads(row) for row in synthetic_corpus(args.words)]
+
+    print(
+        f"{'codec':<14} {'entries (MB)':>12} {'file (MB)':>10} {'decode (us/entry)':>18}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, codec in CODECS.items():
+            encoded = [codec.encode(word_data[0]) for word_data in words]
+            size = sum(
+                len(data.encode("utf-8") if isinstance(data, str) else data)
+                for data in encoded
+            )
+
+            # Best of several runs, the others being slowed down by the rest of the system
+            decode_time = min(
+                timeit.repeat(
+                    lambda: [decode_entry(data) for data in encoded],
+                    number=1,
+                    repeat=REPEAT,
+                )
+            ) / len(encoded)
+
+            url = Path(directory) / f"{name}.db"
+            database = Database(url, codec=codec)
+            database.save_words(words)
+            database.get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            print(
+                f"{name:<14} {size / 1e6:>12.1f} {url.stat().st_size / 1e6:>10.1f}"
+                f" {decode_time * 1e6:>18.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
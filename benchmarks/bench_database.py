@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Measure how many words per second the database saves, imports and exports.
+
+Saving one word at a time (save_word, one transaction each) is compared with
+the batched save_words, import_jsonl and export_jsonl (a single transaction).
+
+Usage:
+    $ python benchmarks/bench_database.py
+    $ python benchmarks/bench_database.py --words 200000 --single-words 2000
+"""
+
+import argparse
+import tempfile
+import time
+from json import loads
+from pathlib import Path
+
+from bench_memory import synthetic_corpus
+
+from english_dictionary.database import Database
+
+
+def rate(count: int, start: float) -> str:
+    return f"{count / (time.perf_counter() - start):>12,.0f} rows/s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument(
+        "--single-words",
+        type=int,
+        default=1_000,
+        help="Number of words saved one at a time (one transaction each)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    words = [loads(row) for row in synthetic_corpus(args.words)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+
+        database = Database(directory / "single.db")
+        start = time.perf_counter()
+        for word_data in words[: args.single_words]:
+            database.save_word(word_data)
+        print(f"{'save_word':<14}{rate(args.single_words, start)}")
+
+        database = Database(directory / "batched.db")
+        start = time.perf_counter()
+        database.save_words(words, batch_size=args.batch_size)
+        print(f"{'save_words':<14}{rate(len(words), start)}")
+
+        start = time.perf_counter()
+        exported = database.export_jsonl(directory / "words.jsonl")
+        print(f"{'export_jsonl':<14}{rate(exported, start)}")
+
+        database = Database(directory / "imported.db")
+        start = time.perf_counter()
+        imported = database.import_jsonl(
+            directory / "words.jsonl", batch_size=args.batch_size
+        )
+        print(f"{'import_jsonl':<14}{rate(imported, start)}")
+
+
+if __name__ == "__main__":
+    main()
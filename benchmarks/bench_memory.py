@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Measure the memory used per word by the WordData object tree.
+
+The slotted, interning classes of english_dictionary.core are compared with dict-backed
+equivalents of the same classes (how they were implemented before), on a synthetic corpus
+decoded from JSON, as it is when loaded from the database.
+
+Usage:
+    $ python benchmarks/bench_memory.py
+    $ python benchmarks/bench_memory.py --words 10000
+"""
+
+import argparse
+import random
+import string
+import tracemalloc
+from dataclasses import dataclass, field
+from json import dumps, loads
+from typing import Callable, List, Optional, Sequence
+
+from english_dictionary.core import WordData
+
+PARTS_OF_SPEECH = ("noun", "verb", "adjective", "adverb", "exclamation")
+RELATIONSHIP_TYPES = ("synonyms", "antonyms")
+
+
+@dataclass
+class DictRelatedWord:
+    relationship_type: str
+    words: Sequence[str] = field(default_factory=list)
+
+
+@dataclass
+class DictPronunciation:
+    text: Sequence[str] = field(default_factory=list)
+    audio: Optional[Sequence[str]] = None
+
+
+@dataclass
+class DictDefinition:
+    definition: Optional[str] = None
+    example: Optional[str] = None
+    related_words: Sequence[DictRelatedWord] = field(default_factory=list)
+
+
+@dataclass
+class DictMeaning:
+    part_of_speech: Optional[str] = None
+    definitions: List[DictDefinition] = field(default_factory=list)
+
+
+class DictWordData:
+    def __init__(self, name, etymology=None, meanings=None, pronunciations=None):
+        self._name = name.lower()
+        self.etymology = etymology if etymology else ""
+        self.pronunciations = pronunciations
+        self.meanings = meanings
+
+
+def dict_backed_from_api(api: List[dict]) -> DictWordData:
+    """Same as WordData.from_api, with the dict-backed classes"""
+    word = api[0]
+    return DictWordData(
+        name=word.get("name"),
+        etymology=word.get("etymology"),
+        pronunciations=[
+            DictPronunciation(**pronunciation)
+            for pronunciation in word.get("pronunciations") or []
+        ],
+        meanings=[
+            DictMeaning(
+                part_of_speech=meaning.get("part_of_speech"),
+                definitions=[
+                    DictDefinition(
+                        definition=definition.get("definition"),
+                        example=definition.get("example"),
+                        related_words=[
+                            DictRelatedWord(**related_word)
+                            for related_word in definition.get("related_words")
+                        ],
+                    )
+                    for definition in meaning.get("definitions")
+                ],
+            )
+            for meaning in word.get("meanings")
+        ],
+    )
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> List[str]:
+    """Return :param count words in the BaseAPI format, serialised as in the database"""
+    rng = random.Random(seed)
+
+    def text(length: int) -> str:
+        return " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+            for _ in range(length)
+        )
+
+    vocabulary = [text(1) for _ in range(max(count // 10, 1))]
+
+    return [
+        dumps(
+            [
+                {
+                    "name": f"{text(1)}{i}",
+                    "etymology": text(12),
+                    "pronunciations": [{"text": text(1), "audio": None}],
+                    "meanings": [
+                        {
+                            "part_of_speech": rng.choice(PARTS_OF_SPEECH),
+                            "definitions": [
+                                {
+                                    "definition": text(10),
+                                    "example": text(6),
+                                    "related_words": [
+                                        {
+                                            "relationship_type": relationship_type,
+                                            "words": rng.sample(vocabulary, k=3),
+                                        }
+                                        for relationship_type in RELATIONSHIP_TYPES
+                                    ],
+                                }
+                                for _ in range(rng.randint(1, 3))
+                            ],
+                        }
+                        for _ in range(rng.randint(1, 2))
+                    ],
+                }
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+def bytes_per_word(
+    from_api: Callable[[List[dict]], object], corpus: List[str]
+) -> float:
+    tracemalloc.start()
+    words = [from_api(loads(row)) for row in corpus]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(words) == len(corpus)
+    return used / len(corpus)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.words)
+    before = bytes_per_word(dict_backed_from_api, corpus)
+    after = bytes_per_word(WordData.from_api, corpus)
+
+    print(f"{'words':>10} {'before (B/word)':>16} {'after (B/word)':>15} {'saved':>7}")
+    print(
+        f"{args.words:>10} {before:>16,.0f} {after:>15,.0f} {1 - after / before:>7.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Measure OrderedList insert throughput for each storage engine.
+
+Usage:
+    $ python benchmarks/bench_ordered_list.py
+    $ python benchmarks/bench_ordered_list.py --sizes 10000 100000 --max-list-size 0
+"""
+
+import argparse
+import random
+import string
+import time
+
+from english_dictionary.core import BlockStore, ListStore, OrderedList
+
+STORAGES = {
+    "ListStore": ListStore,
+    "BlockStore": BlockStore,
+}
+
+
+def random_words(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+        for _ in range(count)
+    ]
+
+
+def bench_inserts(storage, words: list) -> float:
+    """Return the number of inserts per second"""
+    ordered_list = OrderedList(allow_duplicates=False, instance=str, storage=storage)
+
+    start = time.perf_counter()
+    for word in words:
+        ordered_list.append(word)
+    elapsed = time.perf_counter() - start
+
+    return len(words) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument(
+        "--max-list-size",
+        type=int,
+        default=100_000,
+        help="Skip ListStore above this size, since it is quadratic (0 for no limit)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'storage':>12} {'inserts/s':>14}")
+    for size in args.sizes:
+        words = random_words(size)
+
+        for name, storage in STORAGES.items():
+            if storage is ListStore and 0 < args.max_list_size < size:
+                print(f"{size:>10} {name:>12} {'skipped':>14}")
+                continue
+
+            print(f"{size:>10} {name:>12} {bench_inserts(storage, words):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
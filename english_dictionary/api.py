@@ -1,6 +1,28 @@
-from typing import Any, Dict, List, Optional, Sequence
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock, RLock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import ResponseCache, normalise_word
+from .throttle import RetryPolicy, TokenBucket, shared_limiter
 
 BaseAPI = List[Dict[str, Optional[List[Dict[str, List[Dict[str, Any]]]]]]]
 
@@ -76,20 +98,514 @@ class BaseAPIBuilder:
             for data_group in api
         ]
 
+    @staticmethod
+    def from_wiktionary(entries: Iterable[dict]) -> BaseAPI:
+        """
+        Convert Wiktionary entries extracted by wiktextract (one per word and part of speech)
+        to desired API, gathering the entries of a word into a single data group
+        """
+        words: Dict[str, dict] = {}
+
+        for entry in entries:
+            name = entry.get("word")
+            word = words.setdefault(
+                name,
+                {
+                    "name": name,
+                    "pronunciations": [],
+                    "etymology": None,
+                    "meanings": [],
+                },
+            )
+            word["etymology"] = word["etymology"] or entry.get("etymology_text")
+
+            for sound in entry.get("sounds", ()):
+                pronunciation = {
+                    "text": sound.get("ipa"),
+                    "audio": sound.get("mp3_url") or "",
+                }
+                if sound.get("ipa") and pronunciation not in word["pronunciations"]:
+                    word["pronunciations"].append(pronunciation)
+
+            word["meanings"].append(
+                {
+                    "part_of_speech": entry.get("pos"),
+                    "definitions": [
+                        {
+                            "definition": "; ".join(sense["glosses"]),
+                            "example": next(
+                                (
+                                    example.get("text")
+                                    for example in sense.get("examples", ())
+                                ),
+                                None,
+                            ),
+                            "related_words": [
+                                {
+                                    "relationship_type": relationship_type,
+                                    "words": [
+                                        related.get("word")
+                                        for related in sense.get(relationship_type, ())
+                                    ],
+                                }
+                                for relationship_type in ("synonyms", "antonyms")
+                            ],
+                        }
+                        for sense in entry.get("senses", ())
+                        if sense.get("glosses")
+                    ],
+                }
+            )
+
+        return list(words.values())
+
+    @staticmethod
+    def merge(apis: Iterable[BaseAPI]) -> BaseAPI:
+        """
+        Merge the data of a word from several sources, preferring the first ones:
+        the meanings and definitions missing from a data group are added from the following groups of the same name
+        """
+        words: Dict[str, dict] = {}
+
+        for api in apis:
+            for data_group in api:
+                name = data_group.get("name")
+                if name not in words:
+                    words[name] = {
+                        **data_group,
+                        "meanings": [
+                            {**meaning, "definitions": list(meaning["definitions"])}
+                            for meaning in data_group.get("meanings")
+                        ],
+                    }
+                    continue
+
+                word = words[name]
+                word["etymology"] = word.get("etymology") or data_group.get("etymology")
+                word["pronunciations"] = word.get("pronunciations") or data_group.get(
+                    "pronunciations"
+                )
+                meanings = {
+                    meaning.get("part_of_speech"): meaning
+                    for meaning in word["meanings"]
+                }
+
+                for meaning in data_group.get("meanings"):
+                    merged = meanings.get(meaning.get("part_of_speech"))
+                    if merged is None:
+                        word["meanings"].append(
+                            {**meaning, "definitions": list(meaning["definitions"])}
+                        )
+                        continue
+
+                    known = {
+                        definition.get("definition")
+                        for definition in merged["definitions"]
+                    }
+                    merged["definitions"].extend(
+                        definition
+                        for definition in meaning.get("definitions")
+                        if definition.get("definition") not in known
+                    )
+
+        return list(words.values())
+
+
+# Seconds to wait for the connection to be established, and then for the response
+Timeout = Union[float, Tuple[float, float]]
+DEFAULT_TIMEOUT: Timeout = (3.05, 10)
+
 
 class FreeDictionaryApi:
     BASE_URL = r"https://api.dictionaryapi.dev/api/v2/entries/en/"
 
-    def __init__(self):
-        self._word = None
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        base_url: str = BASE_URL,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[TokenBucket] = None,
+        retry: RetryPolicy = RetryPolicy(),
+    ):
+        """
+        :param session: Session used for the requests, keeping connections alive between them.
+            Sessions can be shared by several threads.
+        :param timeout: Connect and read timeouts of the requests, in seconds
+        :param cache: Cache of the responses (and of the words not found)
+        :param limiter: Rate limit of the requests. Defaults to the one shared by every request to the same host
+        :param retry: When and how long to wait before retrying throttled or failed requests
+        """
+        self._session = session if session is not None else requests.Session()
+        self._timeout = timeout
+        self._base_url = base_url
+        self._cache = cache
+        self._limiter = limiter if limiter is not None else shared_limiter(base_url)
+        self._retry = retry
+
+    def _send(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """Send a GET request within the rate limit, retrying it while it is throttled or fails"""
+        attempt = 0
+
+        while True:
+            self._limiter.acquire()
+            try:
+                response = self._session.get(
+                    url, headers=headers, timeout=self._timeout
+                )
+            except requests.ConnectionError:
+                if attempt >= self._retry.retries:
+                    raise
+                retry_after = None
+            else:
+                if (
+                    response.status_code not in self._retry.statuses
+                    or attempt >= self._retry.retries
+                ):
+                    return response
+                retry_after = response.headers.get("Retry-After")
+
+            delay = self._retry.delay(attempt, retry_after)
+            if delay is None:
+                # Asked to wait longer than the maximum backoff: fail rather than hold up a worker
+                return response
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _request(self, word: str) -> requests.Response:
+        # The word cached and the word requested are the same
+        url = self._base_url + normalise_word(word)
+
+        if self._cache is None:
+            return self._send(url)
+
+        cached = self._cache.get(word)
+        if cached is not None and self._cache.is_fresh(cached):
+            return cached.to_response(url)
+
+        headers = cached.validators if cached is not None else {}
+        response = self._send(url, headers)
+
+        if response.status_code == 304 and cached is not None:
+            self._cache.refresh(word)
+            return cached.to_response(url)
+
+        if response.status_code in (200, 404):
+            self._cache.put(word, response)
+
+        return response
 
-    def get_word_data(self, word: str):
-        self._word = requests.get(FreeDictionaryApi.BASE_URL + word.lower())
+    def get_word_data(self, word: str) -> requests.Response:
+        """Raises requests.HTTPError if the word is not found, and requests.Timeout if the API is too slow"""
+        response = self._request(word)
 
-        if self._word.status_code == 200:
-            return self._word
+        if response.status_code == 200:
+            return response
 
-        self._word.raise_for_status()
+        response.raise_for_status()
 
     def get_json(self, word: str):
         return self.get_word_data(word).json()
+
+
+class WordNotFound(LookupError):
+    """Raised by the providers which do not have the word looked up"""
+
+
+class DictionaryProvider(Protocol):
+    """A source of words, such as an online dictionary or a dump file"""
+
+    name: str
+
+    def lookup(self, word: str) -> BaseAPI:
+        """Return the data of :param word in the base API format. Raises WordNotFound if the word is missing"""
+
+
+PROVIDERS: Dict[str, Callable[..., DictionaryProvider]] = {}
+
+
+def register_provider(name: str) -> Callable[[type], type]:
+    """Register a provider class under :param name, so it can be created with create_provider"""
+
+    def register(cls: type) -> type:
+        cls.name = name
+        PROVIDERS[name] = cls
+        return cls
+
+    return register
+
+
+def create_provider(name: str, **options) -> DictionaryProvider:
+    """Create the provider registered under :param name with :param options"""
+    try:
+        factory = PROVIDERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown provider {name!r}, choose from: {', '.join(PROVIDERS)}"
+        ) from None
+
+    return factory(**options)
+
+
+@register_provider("free-dictionary")
+class FreeDictionaryProvider:
+    def __init__(self, api: Optional[FreeDictionaryApi] = None) -> None:
+        self.api = api if api is not None else FreeDictionaryApi()
+
+    def lookup(self, word: str) -> BaseAPI:
+        try:
+            data = self.api.get_json(word)
+        except requests.HTTPError as error:
+            if error.response is not None and error.response.status_code == 404:
+                raise WordNotFound(word) from error
+            raise
+
+        return BaseAPIBuilder.from_free_dictionary_api(data)
+
+
+@register_provider("wiktionary")
+class WiktionaryDumpProvider:
+    """
+    Words of a local Wiktionary dump extracted by wiktextract (one JSON entry per line, as found on kaikki.org).
+
+    The dump is indexed on the first lookup: only the offsets of the English entries are kept in memory,
+    and the entries of a word are read from the file when it is looked up.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+        self._offsets: Optional[Dict[str, List[int]]] = None
+        self._lock = Lock()
+
+    def _index(self) -> Dict[str, List[int]]:
+        with self._lock:
+            if self._offsets is None:
+                offsets = defaultdict(list)
+                with open(self.path, "rb") as file:
+                    offset = 0
+                    for line in file:
+                        if line.strip():
+                            entry = json.loads(line)
+                            if entry.get("lang_code", "en") == "en" and entry.get(
+                                "word"
+                            ):
+                                offsets[entry["word"].lower()].append(offset)
+                        offset += len(line)
+
+                self._offsets = dict(offsets)
+
+            return self._offsets
+
+    def lookup(self, word: str) -> BaseAPI:
+        offsets = self._index().get(word.strip().lower())
+        if not offsets:
+            raise WordNotFound(word)
+
+        entries = []
+        with open(self.path, "rb") as file:
+            for offset in offsets:
+                file.seek(offset)
+                entries.append(json.loads(file.readline()))
+
+        return BaseAPIBuilder.from_wiktionary(entries)
+
+
+class LookupClient:
+    """
+    Non-blocking lookups of words on FreeDictionaryAPI, or on several providers at once.
+
+    Lookups run in a pool of threads sharing a single session, so several can be in flight at once
+    and connections are reused. Each lookup returns a Future, which can be cancelled while it is queued.
+
+    With several providers, each lookup queries all of them concurrently: the first word found is
+    returned without waiting for the slower providers. Their lookups still queued are cancelled, but those
+    already running go on until they end (within the timeout), holding a worker meanwhile.
+    With merge, the lookup waits for every provider and merges the words found instead.
+    With fallback, the providers are queried one after the other instead, in order of preference,
+    so the later ones are only queried for the words the earlier ones do not have (or failed to look up).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        base_url: str = FreeDictionaryApi.BASE_URL,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[TokenBucket] = None,
+        providers: Optional[Sequence[DictionaryProvider]] = None,
+        merge: bool = False,
+        fallback: bool = False,
+    ) -> None:
+        """
+        :param providers: Providers queried, in order of preference. Defaults to FreeDictionaryAPI
+        :param merge: Merge the words found by all the providers instead of returning the first one
+        :param fallback: Query a provider only if the ones before it do not have the word, rather than all at once
+        """
+        if merge and fallback:
+            raise ValueError("Words found by fallback providers cannot be merged")
+
+        self._session = requests.Session()
+        # Keep up to one connection per worker alive (instead of the default 10)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self.max_workers = max_workers
+        self.api = FreeDictionaryApi(self._session, timeout, base_url, cache, limiter)
+        self.providers: List[DictionaryProvider] = (
+            list(providers)
+            if providers is not None
+            else [FreeDictionaryProvider(self.api)]
+        )
+        self.merge = merge
+        self.fallback = fallback
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lookup"
+        )
+        self._pending: Set[Future] = set()
+        self._lock = Lock()
+
+    def lookup(
+        self, word: str, callback: Optional[Callable[["Future[BaseAPI]"], None]] = None
+    ) -> "Future[BaseAPI]":
+        """
+        Look up :param word in the background, returning a Future of its data in the base API format.
+        The Future raises WordNotFound if no provider has the word.
+        :param callback: Called with the Future once the lookup is done, failed or cancelled.
+            It runs in a worker thread (or in this one if the lookup is already done).
+        """
+        if len(self.providers) == 1:
+            future = self._executor.submit(self.providers[0].lookup, word)
+        elif self.fallback:
+            future = self._executor.submit(self._look_up_in_order, word)
+        else:
+            future = self._fan_out(word)
+
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        return future
+
+    def _look_up_in_order(self, word: str) -> BaseAPI:
+        """Look up :param word with each provider in turn, until one has it"""
+        errors = []
+
+        for provider in self.providers:
+            try:
+                return provider.lookup(word)
+            except Exception as error:
+                errors.append(error)
+
+        # A provider which failed (rather than not having the word) may have it
+        raise next(
+            (error for error in errors if not isinstance(error, WordNotFound)),
+            WordNotFound(word),
+        )
+
+    def _fan_out(self, word: str) -> "Future[BaseAPI]":
+        """
+        Look up :param word with every provider at once, returning a Future of the combined result.
+        Once it is known, the lookups not started yet are cancelled (running ones cannot be).
+        """
+        result: "Future[BaseAPI]" = Future()
+        lookups = [
+            self._executor.submit(provider.lookup, word) for provider in self.providers
+        ]
+        # Reentrant: cancelling the lookups calls lookup_done right away
+        lock = RLock()
+
+        def cancel_lookups() -> None:
+            for lookup in lookups:
+                lookup.cancel()
+
+        def resolve(value: Optional[BaseAPI], error: Optional[BaseException]) -> None:
+            try:
+                if error is None:
+                    result.set_result(value)
+                else:
+                    result.set_exception(error)
+            except InvalidStateError:
+                # Cancelled meanwhile
+                pass
+
+        def lookup_done(lookup: Future) -> None:
+            with lock:
+                if result.done():
+                    return
+
+                if not lookup.cancelled() and lookup.exception() is None:
+                    if not self.merge:
+                        resolve(lookup.result(), None)
+                        cancel_lookups()
+                        return
+
+                if not all(lookup.done() for lookup in lookups):
+                    return
+
+                found = [
+                    lookup.result()
+                    for lookup in lookups
+                    if not lookup.cancelled() and lookup.exception() is None
+                ]
+                if found:
+                    resolve(BaseAPIBuilder.merge(found), None)
+                    return
+
+                # A provider which failed (rather than not having the word) may have it
+                errors = [
+                    lookup.exception() for lookup in lookups if not lookup.cancelled()
+                ]
+                resolve(
+                    None,
+                    next(
+                        (
+                            error
+                            for error in errors
+                            if not isinstance(error, WordNotFound)
+                        ),
+                        WordNotFound(word),
+                    ),
+                )
+
+        result.add_done_callback(
+            lambda result: cancel_lookups() if result.cancelled() else None
+        )
+        for lookup in lookups:
+            lookup.add_done_callback(lookup_done)
+
+        return result
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def cancel_all(self) -> None:
+        """Cancel the lookups not started yet. Running lookups end within the timeout"""
+        with self._lock:
+            pending = list(self._pending)
+
+        for future in pending:
+            future.cancel()
+
+    def close(self, cancel_pending: bool = True, wait: bool = True) -> None:
+        """
+        Stop the workers once they are done, cancelling the lookups not started yet if :param cancel_pending.
+        :param wait: Wait for the running lookups to end
+        """
+        if cancel_pending:
+            self.cancel_all()
+
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self._session.close()
+
+    def __enter__(self) -> "LookupClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.close()
@@ -0,0 +1,198 @@
+"""
+Persistent cache of the responses of the dictionary API, so repeated lookups cost no request.
+
+Responses are stored in a SQLite database, keyed by the normalised word.
+Words which were not found (404) are cached too, for a shorter time, so they are not requested again
+in a tight loop. Expired responses carrying an ETag or a Last-Modified date are revalidated with
+a conditional request, which only costs an empty 304 response if the word has not changed.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+
+CACHE_NAME = "cache.db"
+
+DAY = 24 * 60 * 60
+
+
+def normalise_word(word: str) -> str:
+    return " ".join(word.split()).lower()
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def validators(self) -> dict:
+        """Headers making a request conditional on the response having changed since it was cached"""
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def to_response(self, url: str) -> requests.Response:
+        """Rebuild the response, as if it had just been received"""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = "OK" if self.status_code == 200 else "Not Found"
+        response._content = self.content
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json"
+
+        return response
+
+
+class ResponseCache:
+    """
+    Responses (200) and misses (404) of the dictionary API, stored in SQLite.
+
+    At most max_entries responses are kept: the least recently used ones are evicted first.
+    The cache can be shared by several threads.
+    """
+
+    def __init__(
+        self,
+        url: Union[Path, str] = ":memory:",
+        ttl: float = 30 * DAY,
+        negative_ttl: float = DAY,
+        max_entries: int = 10_000,
+    ) -> None:
+        """
+        :param ttl: Seconds a response is used without asking the API whether it changed
+        :param negative_ttl: Seconds a word which was not found is not requested again
+        """
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(url, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+
+        with self._lock, self._connection as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    word TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    content BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    used_at REAL NOT NULL
+                )
+                """,
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at)
+                """,
+            )
+            (self._size,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+
+    def is_fresh(self, response: CachedResponse) -> bool:
+        ttl = self._ttl if response.status_code == 200 else self._negative_ttl
+        return time.time() - response.fetched_at < ttl
+
+    def get(self, word: str) -> Optional[CachedResponse]:
+        """Return the cached response for :param word, even if expired, if any"""
+        word = normalise_word(word)
+
+        with self._lock, self._connection as conn:
+            row = conn.execute(
+                """
+                SELECT status_code, content, etag, last_modified, fetched_at
+                FROM responses WHERE word = ?
+                """,
+                (word,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            conn.execute(
+                """
+                UPDATE responses SET used_at = ? WHERE word = ?
+                """,
+                (time.time(), word),
+            )
+
+        return CachedResponse(*row)
+
+    def put(self, word: str, response: requests.Response) -> None:
+        """Cache :param response (a 200 or 404 response to the lookup of :param word)"""
+        now = time.time()
+        word = normalise_word(word)
+
+        with self._lock, self._connection as conn:
+            if not conn.execute(
+                "SELECT 1 FROM responses WHERE word = ?", (word,)
+            ).fetchone():
+                self._size += 1
+
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                (word, status_code, content, etag, last_modified, fetched_at, used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    word,
+                    response.status_code,
+                    response.content,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    now,
+                    now,
+                ),
+            )
+            if self._size > self._max_entries:
+                # Evict the least recently used responses
+                conn.execute(
+                    """
+                    DELETE FROM responses WHERE word IN (
+                        SELECT word FROM responses ORDER BY used_at LIMIT ?
+                    )
+                    """,
+                    (self._size - self._max_entries,),
+                )
+                self._size = self._max_entries
+
+    def refresh(self, word: str) -> None:
+        """Mark the response for :param word as fresh, after the API confirmed it has not changed"""
+        now = time.time()
+
+        with self._lock, self._connection as conn:
+            conn.execute(
+                """
+                UPDATE responses SET fetched_at = ?, used_at = ? WHERE word = ?
+                """,
+                (now, now, normalise_word(word)),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection as conn:
+            conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        self._connection.close()
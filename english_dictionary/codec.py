@@ -0,0 +1,126 @@
+"""
+Encodings of the word entries (one entry of a BaseAPI) stored in the database.
+
+Rows written as JSON text by older versions keep loading: decode_entry recognises
+both formats, and Database.convert_rows rewrites rows in the format of its codec.
+"""
+
+import marshal
+import zlib
+from json import dumps, loads
+from struct import Struct
+from typing import Any, Dict, Union
+
+Entry = Dict[str, Any]
+
+
+class JsonCodec:
+    """Entries as JSON text (the original format)"""
+
+    # SQLite storage class of the encoded entries
+    storage_class = "text"
+
+    def encode(self, entry: Entry) -> str:
+        return dumps(entry)
+
+    @staticmethod
+    def decode(data: str) -> Entry:
+        return loads(data)
+
+    @staticmethod
+    def is_encoded(data: Union[str, bytes]) -> bool:
+        return isinstance(data, str)
+
+
+class BinaryCodec:
+    """
+    Compact binary encoding of entries, optionally compressed with zlib.
+
+    Layout:
+        magic (2 bytes) | format version (1 byte) | flags (1 byte) | body, zlib-compressed if flags & COMPRESSED
+
+    The body is the entry serialised with marshal (format version 4): it loads faster than JSON text
+    (see benchmarks/bench_codec.py), and is smaller since the keys repeated in an entry ("definition",
+    "related_words"...) are stored once. Like the database holding them, entries are trusted:
+    marshal is not meant to read data crafted to be malicious.
+
+    If flags & JSON, the body is the entry as UTF-8 JSON text instead: entries marshal cannot represent
+    (e.g. with values of types derived from dict or str) are stored this way.
+    """
+
+    storage_class = "blob"
+
+    MAGIC = b"ED"
+    VERSION = 2
+    COMPRESSED = 0b1
+    JSON = 0b10
+
+    _HEADER = Struct("<2sBB")
+    _MARSHAL_VERSION = 4
+
+    def __init__(self, compression_level: int = 0) -> None:
+        """:param compression_level: zlib compression level, from 0 (no compression) to 9"""
+        if not 0 <= compression_level <= 9:
+            raise ValueError("compression_level must be between 0 and 9")
+
+        self._compression_level = compression_level
+
+    @classmethod
+    def is_encoded(cls, data: Union[str, bytes]) -> bool:
+        return isinstance(data, bytes) and data[:2] == cls.MAGIC
+
+    def encode(self, entry: Entry) -> bytes:
+        """Raises ValueError if marshal cannot represent the entry"""
+        body = marshal.dumps(entry, self._MARSHAL_VERSION)
+        flags = 0
+
+        if self._compression_level:
+            body = zlib.compress(body, self._compression_level)
+            flags |= self.COMPRESSED
+
+        return self._HEADER.pack(self.MAGIC, self.VERSION, flags) + body
+
+    @classmethod
+    def encode_json(cls, entry: Entry) -> bytes:
+        """Encode an entry as JSON text, marked so that it is recognised as an entry of this format"""
+        return cls._HEADER.pack(cls.MAGIC, cls.VERSION, cls.JSON) + dumps(entry).encode(
+            "utf-8"
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> Entry:
+        magic, version, flags = cls._HEADER.unpack_from(data)
+
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"unsupported entry format (version {version})")
+
+        body = data[cls._HEADER.size :]
+        if flags & cls.COMPRESSED:
+            body = zlib.decompress(body)
+
+        if flags & cls.JSON:
+            return loads(body)
+
+        return marshal.loads(body)
+
+
+EntryCodec = Union[JsonCodec, BinaryCodec]
+
+
+def encode_entry(entry: Entry, codec: EntryCodec) -> Union[str, bytes]:
+    """
+    Encode an entry with :param codec, or as JSON if the binary codec cannot represent it.
+    The JSON is then marked as binary, so the entry is not taken for one to convert.
+    """
+    try:
+        return codec.encode(entry)
+    except ValueError:
+        return BinaryCodec.encode_json(entry)
+
+
+def decode_entry(data: Union[str, bytes]) -> Entry:
+    """Decode an entry stored in any of the supported formats"""
+    if BinaryCodec.is_encoded(data):
+        return BinaryCodec.decode(data)
+
+    return JsonCodec.decode(data)
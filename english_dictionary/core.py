@@ -1,18 +1,335 @@
+from bisect import bisect_left, bisect_right, insort_left
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, List, NoReturn, Optional, Sequence, Type, Union
+from heapq import nsmallest
+from itertools import chain, count, islice, takewhile
+from sys import intern
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
-from .utils.helpers import binary_search
+from .utils.helpers import LRUCache, add_slots, edit_distance
+
+
+class ListStore:
+    """
+    Sorted storage backed by a single python list.
+
+    Lookups are O(log n), but every insertion or removal shifts the tail of the list, making them O(n).
+    """
+
+    def __init__(self) -> None:
+        self._list = []
+
+    def add(self, item) -> None:
+        """Insert an item, to the left of any equal items"""
+        insort_left(self._list, item)
+
+    def load_sorted(self, items: list) -> None:
+        """Replace the contents with :param items, which must already be sorted"""
+        self._list = items
+
+    def append_sorted(self, items: list) -> None:
+        """Add :param items, which must be sorted and not less than the current items, at the end"""
+        self._list.extend(items)
+
+    def bisect_left(self, item) -> int:
+        return bisect_left(self._list, item)
+
+    def bisect_right(self, item) -> int:
+        return bisect_right(self._list, item)
+
+    def pop(self, index: int = -1):
+        return self._list.pop(index)
+
+    def islice(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        """Lazily yield the items from position :param start up to (excluding) :param stop"""
+        return islice(self._list, start, stop)
+
+    def clear(self) -> None:
+        self._list = []
+
+    def __getitem__(self, index):
+        return self._list[index]
+
+    def __iter__(self) -> Iterator:
+        return iter(self._list)
+
+    def __len__(self) -> int:
+        return len(self._list)
+
+    def __repr__(self) -> str:
+        return f"{self._list}"
+
+
+class BlockStore:
+    """
+    Sorted storage split into a list of sorted blocks (a chunked sorted list).
+
+    Each block holds at most ``2 * load`` items, so an insertion or removal only shifts the items of one block.
+    The maximum of every block is kept in a separate list to find the right block with a binary search, and a
+    Fenwick tree over the block lengths converts between positions and blocks.
+    Insert, remove and index are therefore O(log n) for any practical size.
+    """
+
+    DEFAULT_LOAD = 1000
+
+    def __init__(self, load: int = DEFAULT_LOAD) -> None:
+        if load < 1:
+            raise ValueError("load must be a positive integer")
+
+        self._load = load
+        self._len = 0
+        self._blocks: List[list] = []
+        self._maxes: list = []
+        # Fenwick tree of the block lengths, rebuilt lazily after blocks are split or merged
+        self._tree: List[int] = []
+        self._tree_is_stale = False
+
+    def _build_tree(self) -> None:
+        tree = [len(block) for block in self._blocks]
+
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+        self._tree = tree
+        self._tree_is_stale = False
+
+    def _update_tree(self, block_index: int, delta: int) -> None:
+        if self._tree_is_stale:
+            return
+
+        tree = self._tree
+        while block_index < len(tree):
+            tree[block_index] += delta
+            block_index |= block_index + 1
+
+    def _offset(self, block_index: int) -> int:
+        """Return the number of items stored in the blocks before :param block_index"""
+        if self._tree_is_stale:
+            self._build_tree()
+
+        total = 0
+        tree = self._tree
+        while block_index > 0:
+            total += tree[block_index - 1]
+            block_index &= block_index - 1
+
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Return the block containing the item at position :param index and its offset within that block"""
+        if self._tree_is_stale:
+            self._build_tree()
+
+        tree = self._tree
+        block_index = 0
+        step = 1 << (len(tree).bit_length() - 1) if tree else 0
+
+        while step:
+            next_index = block_index + step
+            if next_index <= len(tree) and tree[next_index - 1] <= index:
+                block_index = next_index
+                index -= tree[next_index - 1]
+            step >>= 1
+
+        return block_index, index
+
+    def _normalise_index(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+
+        if not 0 <= index < self._len:
+            raise IndexError("index out of range")
+
+        return index
+
+    def _split(self, block_index: int) -> None:
+        block = self._blocks[block_index]
+        half = block[self._load :]
+        del block[self._load :]
+
+        self._blocks.insert(block_index + 1, half)
+        self._maxes[block_index] = block[-1]
+        self._maxes.insert(block_index + 1, half[-1])
+        self._tree_is_stale = True
+
+    def _delete(self, block_index: int, offset: int):
+        block = self._blocks[block_index]
+        item = block.pop(offset)
+        self._len -= 1
+
+        if not block:
+            del self._blocks[block_index]
+            del self._maxes[block_index]
+            self._tree_is_stale = True
+            return item
+
+        self._maxes[block_index] = block[-1]
+        self._update_tree(block_index, -1)
+
+        # Merge small blocks with their neighbours to keep the number of blocks proportional to n / load
+        if len(block) < self._load // 2 and len(self._blocks) > 1:
+            if block_index == 0:
+                block_index = 1
+            self._blocks[block_index - 1].extend(self._blocks.pop(block_index))
+            self._maxes[block_index - 1] = self._maxes.pop(block_index)
+            self._tree_is_stale = True
+
+            if len(self._blocks[block_index - 1]) > 2 * self._load:
+                self._split(block_index - 1)
+
+        return item
+
+    def add(self, item) -> None:
+        """Insert an item, to the left of any equal items"""
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+            self._len = 1
+            self._tree_is_stale = True
+            return
+
+        block_index = bisect_left(self._maxes, item)
+
+        if block_index == len(self._blocks):
+            block_index -= 1
+            self._blocks[block_index].append(item)
+            self._maxes[block_index] = item
+        else:
+            insort_left(self._blocks[block_index], item)
+
+        self._len += 1
+        self._update_tree(block_index, 1)
+
+        if len(self._blocks[block_index]) > 2 * self._load:
+            self._split(block_index)
+
+    def load_sorted(self, items: list) -> None:
+        """Replace the contents with :param items, which must already be sorted"""
+        load = self._load
+        self._blocks = [items[i : i + load] for i in range(0, len(items), load)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(items)
+        self._tree_is_stale = True
+
+    def append_sorted(self, items: list) -> None:
+        """Add :param items, which must be sorted and not less than the current items, at the end"""
+        if not items:
+            return
+
+        load = self._load
+        self._len += len(items)
+        self._tree_is_stale = True
+
+        if self._blocks and len(self._blocks[-1]) < load:
+            last_block = self._blocks[-1]
+            room = load - len(last_block)
+            last_block.extend(items[:room])
+            self._maxes[-1] = last_block[-1]
+            items = items[room:]
+
+        for i in range(0, len(items), load):
+            block = items[i : i + load]
+            self._blocks.append(block)
+            self._maxes.append(block[-1])
+
+    def bisect_left(self, item) -> int:
+        block_index = bisect_left(self._maxes, item)
+
+        if block_index == len(self._blocks):
+            return self._len
+
+        return self._offset(block_index) + bisect_left(self._blocks[block_index], item)
+
+    def bisect_right(self, item) -> int:
+        block_index = bisect_right(self._maxes, item)
+
+        if block_index == len(self._blocks):
+            return self._len
+
+        return self._offset(block_index) + bisect_right(self._blocks[block_index], item)
+
+    def pop(self, index: int = -1):
+        return self._delete(*self._locate(self._normalise_index(index)))
+
+    def islice(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        """Lazily yield the items from position :param start up to (excluding) :param stop"""
+        start, stop, _ = slice(start, stop).indices(self._len)
+        remaining = stop - start
+
+        if remaining <= 0:
+            return
+
+        block_index, offset = self._locate(start)
+
+        for block in islice(self._blocks, block_index, None):
+            chunk = block[offset : offset + remaining]
+            yield from chunk
+            remaining -= len(chunk)
+            if remaining <= 0:
+                return
+            offset = 0
+
+    def clear(self) -> None:
+        self._len = 0
+        self._blocks = []
+        self._maxes = []
+        self._tree = []
+        self._tree_is_stale = False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return list(self.islice(start, stop))
+            return list(self)[index]
+
+        block_index, offset = self._locate(self._normalise_index(index))
+        return self._blocks[block_index][offset]
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._blocks)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"{list(self)}"
 
 
 class OrderedList:
+    # Optional key used to sort items in bulk. Items are compared directly when it is None
+    _sort_key: Optional[Callable[[Any], Any]] = None
+
     def __init__(
         self,
         allow_duplicates: bool = False,
         instance: Type[Any] = int,
+        storage: Callable[[], Union[ListStore, BlockStore]] = BlockStore,
     ) -> None:
+        """
+        :param storage: Factory of the sorted container holding the items.
+            BlockStore (the default) scales to millions of items, ListStore is the plain python list.
+        """
         self._allow_duplicates = allow_duplicates
         self._instance = instance
-        self._list = []
+        self._storage = storage
+        self._list = storage()
 
     @staticmethod
     def bisect_left(
@@ -35,7 +352,7 @@ class OrderedList:
 
     def insort_left(self, item) -> None:
         """Insert an item with into the list but maintain order"""
-        self._list.insert(self.bisect_left(self._list, item), item)
+        self._list.add(item)
 
     def append(self, item) -> None:
         """Add a new item to the list"""
@@ -45,15 +362,20 @@ class OrderedList:
         if (not self._allow_duplicates) and (item in self):
             return
 
-        if len(self) < 1:
-            self._list.append(item)
-            return
-
         self.insort_left(item)
 
     def find(self, target) -> int:
         """Return the index of :param target or -1 if not found."""
-        return binary_search(self._list, target)
+        index = self._list.bisect_left(target)
+
+        if index < len(self._list) and self._list[index] == target:
+            return index
+
+        return -1
+
+    def insertion_index(self, item) -> int:
+        """Return the index of (the first occurrence of) :param item, or the index it would be inserted at"""
+        return self._list.bisect_left(item)
 
     def index(self, item) -> Union[int, List[int], NoReturn]:
         """
@@ -66,18 +388,65 @@ class OrderedList:
         if not self._allow_duplicates:
             return self.find(item)
 
-        first_item_index = self._list.index(item)
-
-        return list(range(first_item_index, first_item_index + self._list.count(item)))
+        return list(range(self._list.bisect_left(item), self._list.bisect_right(item)))
 
     def append_multiple(self, iterable) -> None:
         """Convenience function to add multiple items to the list"""
-        for item in iterable:
-            self.append(item)
+        self.extend_sorted(iterable)
+
+    def extend_sorted(self, iterable) -> None:
+        """
+        Add multiple items at once.
+        The items are sorted together with the current contents in a single pass (O(n log n)),
+        instead of being inserted one at a time. Items sorting after all the current ones
+        (e.g. when loading in order, chunk by chunk) are appended without touching the current ones.
+        When duplicates are not allowed, items already in the list take precedence over new ones.
+        """
+        new_items = list(iterable)
+
+        for item in new_items:
+            if not isinstance(item, self._instance):
+                raise ValueError
+
+        if not new_items:
+            return
+
+        key = self._sort_key or (lambda item: item)
+        new_items.sort(key=self._sort_key)
+
+        if not self._list or key(self._list[-1]) < key(new_items[0]):
+            self._list.append_sorted(
+                new_items if self._allow_duplicates else self._deduplicate(new_items)
+            )
+            return
+
+        # The current items come first so the (stable) sort keeps them ahead of equal new items
+        items = list(self._list)
+        items.extend(new_items)
+        items.sort(key=self._sort_key)
+
+        if not self._allow_duplicates:
+            items = self._deduplicate(items)
+
+        self._list.load_sorted(items)
+
+    def _deduplicate(self, items: list) -> list:
+        """Keep the first of every run of equal items in the sorted list :param items"""
+        key = self._sort_key or (lambda item: item)
+        unique_items = []
+        previous_key = object()
+
+        for item in items:
+            item_key = key(item)
+            if item_key != previous_key:
+                unique_items.append(item)
+                previous_key = item_key
+
+        return unique_items
 
     def peek(self) -> list:
         """Return a copy of the list"""
-        return self._list[:]
+        return list(self._list)
 
     def pop(self, index=-1) -> Union[int, NoReturn]:
         """Remove and return item at index (default last).
@@ -87,11 +456,12 @@ class OrderedList:
 
     def remove(self, item) -> None:
         """Removes the first occurrence of :param item from the list"""
-        self.pop(self.index(item))
+        index = self.index(item)
+        self.pop(index[0] if self._allow_duplicates else index)
 
     def clear(self) -> None:
         """Removes all elements in the list"""
-        self._list = []
+        self._list = self._storage()
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -102,15 +472,30 @@ class OrderedList:
     def __len__(self) -> int:
         return len(self._list)
 
+    def __getitem__(self, index):
+        return self._list[index]
+
     def __contains__(self, item) -> bool:
-        return binary_search(self._list, item) != -1
+        return self.find(item) != -1
 
 
+# The classes below are instantiated for every definition of every word, so they are slotted,
+# and the values repeated across the corpus (relationship types, parts of speech, related words) are interned.
+
+
+@add_slots
 @dataclass
 class RelatedWord:
     relationship_type: str
     words: Sequence[str] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        if self.relationship_type:
+            self.relationship_type = intern(self.relationship_type)
+
+        if self.words:
+            self.words = [intern(word) for word in self.words]
+
     def to_html(self) -> str:
         return (
             f"<b>{self.relationship_type.capitalize()}</b>: {', '.join(self.words)}"
@@ -122,6 +507,7 @@ class RelatedWord:
         return getattr(item)
 
 
+@add_slots
 @dataclass
 class Pronunciation:
     text: Sequence[str] = field(default_factory=list)
@@ -134,6 +520,7 @@ class Pronunciation:
         return getattr(item)
 
 
+@add_slots
 @dataclass
 class Definition:
     definition: Optional[str] = None
@@ -159,11 +546,16 @@ class Definition:
         return getattr(item)
 
 
+@add_slots
 @dataclass
 class Meaning:
     part_of_speech: Optional[str] = None
     definitions: List[Definition] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        if self.part_of_speech:
+            self.part_of_speech = intern(self.part_of_speech)
+
     def to_html(self) -> str:
         pos = f"<p style='text-align : center; text-decoration: underline'>Part of speech: {self.part_of_speech}</p>\n"
         definitions = "<hr />".join(
@@ -176,6 +568,8 @@ class Meaning:
 
 
 class WordData:
+    __slots__ = ("_name", "etymology", "pronunciations", "meanings")
+
     def __init__(
         self,
         name: str,
@@ -236,6 +630,9 @@ class WordData:
     def __len__(self) -> int:
         return len(self._name)
 
+    def __lt__(self, other) -> bool:
+        return self._name < other.get_name()
+
     def __le__(self, other) -> bool:
         return self._name < other.get_name()
 
@@ -246,17 +643,425 @@ class WordData:
         return self._name == other.get_name()
 
 
+class WordStub(WordData):
+    """
+    Lightweight placeholder for a word stored in the database: only its name and row id are kept in memory.
+    Dictionary loads the full WordData the first time the word is looked up.
+    """
+
+    __slots__ = ("row_id",)
+
+    def __init__(self, name: str, row_id: int) -> None:
+        self._name = name.lower()
+        self.row_id = row_id
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigrams (three-character substrings) to the words containing them.
+
+    A substring query is answered by intersecting the posting sets of its trigrams and checking the
+    few remaining candidates, instead of scanning every word.
+    Words are padded with a boundary marker so that words shorter than three characters have trigrams too.
+    """
+
+    BOUNDARY = "\x00"
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+
+        for word in words:
+            self.add(word)
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def _padded_trigrams(self, word: str) -> Set[str]:
+        return self.trigrams(f"{self.BOUNDARY}{word}{self.BOUNDARY}")
+
+    def add(self, word: str) -> None:
+        for trigram in self._padded_trigrams(word):
+            self._postings[trigram].add(word)
+
+    def remove(self, word: str) -> None:
+        for trigram in self._padded_trigrams(word):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                continue
+
+            posting.discard(word)
+            if not posting:
+                del self._postings[trigram]
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Return (at most :param limit of) the words containing :param text, in sorted order"""
+        text = text.lower()
+        if not text:
+            return []
+
+        trigrams = self.trigrams(text)
+
+        if trigrams:
+            postings = sorted(
+                (self._postings.get(trigram, set()) for trigram in trigrams), key=len
+            )
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            # Shorter than a trigram: the matches are the words of every trigram containing the text.
+            # The number of distinct trigrams is bounded by the alphabet, not by the number of words.
+            candidates = set().union(
+                *(words for trigram, words in self._postings.items() if text in trigram)
+            )
+
+        matches = (word for word in candidates if text in word)
+
+        return sorted(matches) if limit is None else nsmallest(limit, matches)
+
+
+class SpellingIndex:
+    """
+    Symmetric delete spelling index (as in SymSpell) for "did you mean" suggestions.
+
+    Every word is stored under all the strings obtained by deleting up to max_distance characters from it.
+    Two words within that edit distance of each other share at least one of those deletes, so the candidates
+    for a query are found with a few dict lookups, and only they are compared with the query.
+    Only the first prefix_length characters are used to generate deletes, which bounds the memory per word.
+    As in SymSpell, this can miss a candidate whose edits shift the characters of that prefix.
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str] = (),
+        max_distance: int = 2,
+        prefix_length: int = 7,
+    ) -> None:
+        self._max_distance = max_distance
+        self._prefix_length = prefix_length
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+
+        for word in words:
+            self.add(word)
+
+    def _generate_deletes(self, word: str, max_distance: int) -> Set[str]:
+        deletes = {word[: self._prefix_length]}
+        edits = deletes
+
+        for _ in range(max_distance):
+            edits = {
+                edit[:i] + edit[i + 1 :] for edit in edits for i in range(len(edit))
+            }
+            deletes |= edits
+
+        return deletes
+
+    def add(self, word: str) -> None:
+        for delete in self._generate_deletes(word, self._max_distance):
+            self._deletes[delete].add(word)
+
+    def remove(self, word: str) -> None:
+        for delete in self._generate_deletes(word, self._max_distance):
+            words = self._deletes.get(delete)
+            if words is None:
+                continue
+
+            words.discard(word)
+            if not words:
+                del self._deletes[delete]
+
+    def suggest(
+        self,
+        word: str,
+        max_distance: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Return (at most :param limit of) the words within :param max_distance edits of :param word,
+        closest first, then in alphabetical order
+        """
+        word = word.lower()
+        if max_distance is None or max_distance > self._max_distance:
+            max_distance = self._max_distance
+
+        candidates = set().union(
+            *(
+                self._deletes.get(delete, ())
+                for delete in self._generate_deletes(word, max_distance)
+            )
+        )
+        suggestions = sorted(
+            (distance, candidate)
+            for candidate in candidates
+            if abs(len(candidate) - len(word)) <= max_distance
+            and (distance := edit_distance(word, candidate, max_distance))
+            <= max_distance
+        )
+
+        return [candidate for _, candidate in suggestions[:limit]]
+
+
+@add_slots
+@dataclass
+class ThesaurusEntry:
+    """A definition listing a related term: the word, the positions of the meaning and definition, and how they relate"""
+
+    headword: str
+    meaning: int
+    definition: int
+    relationship_type: str
+
+
+class ThesaurusIndex:
+    """
+    Reverse thesaurus: from a related term (synonym, antonym...) to the definitions listing it.
+
+    Terms are looked up in a dict, so a lookup costs the same whatever the number of words,
+    and adding or removing a word only touches the terms of that word.
+    """
+
+    def __init__(self, words: Iterable[WordData] = ()) -> None:
+        self._postings: Dict[str, Dict[str, List[ThesaurusEntry]]] = defaultdict(dict)
+        self._terms: Dict[str, Set[str]] = {}
+
+        for word in words:
+            self.add(word)
+
+    @staticmethod
+    def entries(word: WordData) -> Iterator[Tuple[str, ThesaurusEntry]]:
+        """Yield the (term, entry) pairs of every related term of :param word"""
+        for meaning_position, meaning in enumerate(word.meanings or ()):
+            for definition_position, definition in enumerate(meaning.definitions):
+                for related_word in definition.related_words:
+                    for term in related_word.words or ():
+                        yield term.lower(), ThesaurusEntry(
+                            word.get_name(),
+                            meaning_position,
+                            definition_position,
+                            related_word.relationship_type,
+                        )
+
+    def add(self, word: WordData) -> None:
+        """Index the related terms of :param word, replacing those indexed for it before"""
+        self.remove(word.get_name())
+        if isinstance(word, WordStub):
+            # Not loaded yet, so there is nothing to index
+            return
+
+        terms = set()
+        for term, entry in self.entries(word):
+            self._postings[term].setdefault(entry.headword, []).append(entry)
+            terms.add(term)
+
+        if terms:
+            self._terms[word.get_name()] = terms
+
+    def remove(self, headword: str) -> None:
+        for term in self._terms.pop(headword, ()):
+            posting = self._postings[term]
+            del posting[headword]
+            if not posting:
+                del self._postings[term]
+
+    def lookup(
+        self, term: str, relationship_type: Optional[str] = None
+    ) -> List[ThesaurusEntry]:
+        """Return the entries listing :param term (as :param relationship_type, if given), sorted by word"""
+        posting = self._postings.get(term.lower(), {})
+
+        return [
+            entry
+            for headword in sorted(posting)
+            for entry in posting[headword]
+            if relationship_type is None or entry.relationship_type == relationship_type
+        ]
+
+
 class Dictionary(OrderedList):
-    def __init__(self) -> None:
-        super().__init__(allow_duplicates=False, instance=WordData)
+    """
+    Sorted collection of words.
+
+    Besides the sorted storage (used for iteration and the list view),
+    a name -> WordData hash index is kept in sync so exact lookups are O(1).
+    """
+
+    _sort_key = staticmethod(WordData.get_name)
+
+    def __init__(
+        self,
+        storage: Callable[[], Union[ListStore, BlockStore]] = BlockStore,
+        loader: Optional[Callable[[int], List[dict]]] = None,
+        cache_size: int = 256,
+        thesaurus: Optional[
+            Callable[[str, Optional[str]], List[ThesaurusEntry]]
+        ] = None,
+    ) -> None:
+        """
+        :param loader: Returns the API data of a word given its database row id.
+            Required to look up words added as WordStub, which are loaded lazily.
+        :param cache_size: Maximum number of loaded WordStub details kept in memory
+        :param thesaurus: Looks up related words among all the stored words (e.g. Database.find_related).
+            The details of WordStub are not in memory, so find_related needs it to cover them.
+        """
+        super().__init__(allow_duplicates=False, instance=WordData, storage=storage)
+        self._index: Dict[str, WordData] = {}
+        self._loader = loader
+        self._loaded = LRUCache(maxsize=cache_size)
+        self._thesaurus_lookup = thesaurus
+        # Built on the first substring search or suggestion, then kept in sync
+        self._trigrams: Optional[TrigramIndex] = None
+        self._spelling: Optional[SpellingIndex] = None
+        # Covers the words held in memory: WordStub are indexed once loaded.
+        # Not built when the related words are looked up with thesaurus instead
+        self._thesaurus: Optional[ThesaurusIndex] = (
+            ThesaurusIndex() if thesaurus is None else None
+        )
+        # Only the words removed (or replaced) get a revision of their own
+        self._revision_counter = count(1)
+        self._revisions: Dict[str, int] = {}
+        self._base_revision = 0
+
+    def _add_to_indexes(self, word: WordData) -> None:
+        self._index[word.get_name()] = word
+
+        if self._thesaurus is not None:
+            self._thesaurus.add(word)
+
+        if self._trigrams is not None:
+            self._trigrams.add(word.get_name())
+
+        if self._spelling is not None:
+            self._spelling.add(word.get_name())
+
+    def _remove_from_indexes(self, word: WordData) -> None:
+        del self._index[word.get_name()]
+        self._revisions[word.get_name()] = next(self._revision_counter)
+        self._loaded.discard(word.get_name())
+
+        if self._thesaurus is not None:
+            self._thesaurus.remove(word.get_name())
+
+        if self._trigrams is not None:
+            self._trigrams.remove(word.get_name())
+
+        if self._spelling is not None:
+            self._spelling.remove(word.get_name())
+
+    def append(self, item: WordData) -> None:
+        size = len(self)
+        super().append(item)
+
+        if len(self) > size:
+            self._add_to_indexes(item)
+
+    def extend_sorted(self, iterable) -> None:
+        new_words = list(iterable)
+        super().extend_sorted(new_words)
+
+        # Only the words actually added are indexed: words already present take precedence
+        for word in new_words:
+            if self._index.setdefault(word.get_name(), word) is word:
+                self._add_to_indexes(word)
+
+    def pop(self, index=-1) -> WordData:
+        word = super().pop(index)
+        self._remove_from_indexes(word)
+        return word
+
+    def clear(self) -> None:
+        super().clear()
+        self._index = {}
+        self._revisions = {}
+        self._base_revision = next(self._revision_counter)
+        self._loaded.clear()
+        if self._thesaurus is not None:
+            self._thesaurus = ThesaurusIndex()
+        self._trigrams = None
+        self._spelling = None
 
     def peek(self) -> list:
         return list(map(str, self._list))
 
+    def bulk_load(self, iterable) -> None:
+        """Add many words at once, e.g. when loading the database"""
+        self.extend_sorted(iterable)
+
     def edit_word(self, old: WordData, new: WordData) -> None:
         self.remove(old)
         self.append(new)
 
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Return (at most :param limit of) the words starting with :param prefix, in sorted order.
+        The matches form a contiguous range of the sorted storage, so this is O(log n + k).
+        """
+        prefix = prefix.lower()
+        start = self._list.bisect_left(WordData(prefix))
+        names = map(WordData.get_name, self._list.islice(start))
+
+        return list(
+            islice(takewhile(lambda name: name.startswith(prefix), names), limit)
+        )
+
+    def search_contains(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Return (at most :param limit of) the words containing :param text, in sorted order"""
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(self._index)
+
+        return self._trigrams.search(text, limit)
+
+    def suggest(
+        self,
+        word: str,
+        max_distance: int = 2,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Return (at most :param limit of) the words closest to :param word, e.g. to correct a typo"""
+        if self._spelling is None:
+            self._spelling = SpellingIndex(self._index)
+
+        return self._spelling.suggest(word, max_distance, limit)
+
+    def find_related(
+        self, term: str, relationship_type: Optional[str] = None
+    ) -> List[ThesaurusEntry]:
+        """
+        Return where :param term is listed as a related word (e.g. every word it is a synonym of),
+        optionally only as :param relationship_type.
+        Without a thesaurus given to the dictionary, only the words held in memory are covered:
+        words added as WordStub are left out until they are loaded.
+        """
+        if self._thesaurus_lookup is not None:
+            return self._thesaurus_lookup(term, relationship_type)
+
+        return self._thesaurus.lookup(term, relationship_type)
+
     def get_word_details(self, word: str) -> WordData:
-        """Return WordData by specifying word alone"""
-        return self._list[binary_search(self.peek(), word)]
+        """
+        Return WordData by specifying word alone.
+        Words added as WordStub are loaded (and cached) on the first lookup.
+        Raises KeyError if the word is not in the dictionary.
+        """
+        word_data = self._index[word]
+
+        if not isinstance(word_data, WordStub):
+            return word_data
+
+        loaded = self._loaded.get(word)
+        if loaded is None:
+            loaded = WordData.from_api(self._loader(word_data.row_id))
+            self._loaded.put(word, loaded)
+            if self._thesaurus is not None:
+                self._thesaurus.add(loaded)
+
+        return loaded
+
+    def revision(self, word: str) -> int:
+        """
+        Return the revision of :param word, which changes whenever the word is edited, removed or added again.
+        Data derived from a word (e.g. its rendered HTML) can be cached along with its revision.
+        """
+        return self._revisions.get(word, self._base_revision)
+
+    def __contains__(self, item: Union[WordData, str]) -> bool:
+        """Check membership by WordData or by the word alone"""
+        return (item if isinstance(item, str) else item.get_name()) in self._index
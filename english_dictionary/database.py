@@ -1,13 +1,525 @@
+import re
 import sqlite3
+import threading
+from itertools import islice
 from json import dumps, loads
 from pathlib import Path
 from sqlite3 import Connection
-from typing import Any, Generator, Optional, Union
+from time import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .api import BaseAPI
+from .codec import BinaryCodec, EntryCodec, decode_entry, encode_entry
+from .core import ThesaurusEntry
 
 DATABASE_DIRECTORY = Path(__file__).resolve().parent
 DATABASE_NAME = "words.db"
+DEFAULT_CODEC = BinaryCodec()
+
+
+def _searchable_text(entry: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Return the definitions, examples and etymology of a word (one entry of a BaseAPI) as text"""
+    definitions = []
+    examples = []
+
+    for meaning in entry.get("meanings") or []:
+        for definition in meaning.get("definitions") or []:
+            definitions.append(definition.get("definition") or "")
+            examples.append(definition.get("example") or "")
+
+    return "\n".join(definitions), "\n".join(examples), entry.get("etymology") or ""
+
+
+def _index_text(conn: Connection, row_id: int, entry: Dict[str, Any]) -> None:
+    """Add the searchable text of the word stored at :param row_id to the full-text index"""
+    conn.execute(
+        """
+        INSERT INTO words_fts (rowid, name, definitions, examples, etymology)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (row_id, entry.get("name"), *_searchable_text(entry)),
+    )
+
+
+def _reindex_texts(conn: Connection, entries: Sequence[Dict[str, Any]]) -> None:
+    """Replace the full-text index rows of the (already saved) words :param entries"""
+    conn.executemany(
+        """
+        DELETE FROM words_fts WHERE rowid = (SELECT id FROM words WHERE name = ?)
+        """,
+        ((entry["name"],) for entry in entries),
+    )
+    conn.executemany(
+        """
+        INSERT INTO words_fts (rowid, name, definitions, examples, etymology)
+        SELECT id, name, ?, ?, ? FROM words WHERE name = ?
+        """,
+        ((*_searchable_text(entry), entry["name"]) for entry in entries),
+    )
+
+
+def _unindex_text(conn: Connection, name: str) -> None:
+    """Remove every word called :param name from the full-text index"""
+    conn.execute(
+        """
+        DELETE FROM words_fts WHERE rowid IN (SELECT id FROM words WHERE name = ?)
+        """,
+        (name,),
+    )
+
+
+def _create_full_text_index(conn: Connection) -> None:
+    """
+    Create the FTS5 table indexing the text of every word (rowid = words.id)
+    and index the words saved before it existed.
+    """
+    exists = conn.execute(
+        """
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words_fts'
+        """
+    ).fetchone()
+
+    if exists:
+        return
+
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE words_fts USING fts5(
+            name,
+            definitions,
+            examples,
+            etymology,
+            tokenize = 'porter unicode61'
+        )
+        """
+    )
+
+    for row_id, data in conn.execute("SELECT id, data FROM words").fetchall():
+        _index_text(conn, row_id, decode_entry(data))
+
+
+def _add_unique_name_index(conn: Connection) -> None:
+    """Drop duplicate words, keeping the most recently saved one, and make names unique"""
+    conn.execute(
+        """
+        DELETE FROM words_fts WHERE rowid IN (
+            SELECT id FROM words WHERE id NOT IN (SELECT max(id) FROM words GROUP BY name)
+        )
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM words WHERE id NOT IN (SELECT max(id) FROM words GROUP BY name)
+        """
+    )
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS words_name ON words (name)
+        """
+    )
+
+
+def _thesaurus_rows(entry: Dict[str, Any]) -> Iterator[Tuple[str, int, int, str]]:
+    """Yield a (term, meaning position, definition position, relationship type) row per related word of :param entry"""
+    for meaning_position, meaning in enumerate(entry.get("meanings") or []):
+        for definition_position, definition in enumerate(
+            meaning.get("definitions") or []
+        ):
+            for group in definition.get("related_words") or []:
+                for term in group.get("words") or []:
+                    yield (
+                        term.lower(),
+                        meaning_position,
+                        definition_position,
+                        group.get("relationship_type"),
+                    )
+
+
+def _reindex_thesaurus(conn: Connection, entries: Sequence[Dict[str, Any]]) -> None:
+    """Replace the thesaurus rows of the (already saved) words :param entries"""
+    conn.executemany(
+        """
+        DELETE FROM thesaurus WHERE word_id = (SELECT id FROM words WHERE name = ?)
+        """,
+        ((entry["name"],) for entry in entries),
+    )
+    conn.executemany(
+        """
+        INSERT INTO thesaurus (term, word_id, meaning, definition, relationship_type)
+        SELECT ?, id, ?, ?, ? FROM words WHERE name = ?
+        """,
+        ((*row, entry["name"]) for entry in entries for row in _thesaurus_rows(entry)),
+    )
+
+
+def _create_thesaurus(conn: Connection) -> None:
+    """Create the reverse thesaurus (related term -> words listing it) and fill it with the stored words"""
+    conn.execute(
+        """
+        CREATE TABLE thesaurus (
+            term TEXT NOT NULL,
+            word_id INTEGER NOT NULL REFERENCES words (id) ON DELETE CASCADE,
+            meaning INTEGER NOT NULL,
+            definition INTEGER NOT NULL,
+            relationship_type TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX thesaurus_term ON thesaurus (term, relationship_type)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX thesaurus_word ON thesaurus (word_id)
+        """
+    )
+    conn.executemany(
+        """
+        INSERT INTO thesaurus (term, word_id, meaning, definition, relationship_type)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (
+            (term, row_id, meaning, definition, relationship_type)
+            for row_id, data in conn.execute("SELECT id, data FROM words").fetchall()
+            for term, meaning, definition, relationship_type in _thesaurus_rows(
+                decode_entry(data)
+            )
+        ),
+    )
+
+
+def _is_normalised(conn: Connection) -> bool:
+    return bool(
+        conn.execute(
+            """
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meanings'
+            """
+        ).fetchone()
+    )
+
+
+def _create_normalised_tables(conn: Connection) -> None:
+    """Create the tables of the normalised schema (see Database.normalise)"""
+    columns = {column for (_, column, *_) in conn.execute("PRAGMA table_info(words)")}
+    if "etymology" not in columns:
+        conn.execute("ALTER TABLE words ADD COLUMN etymology TEXT")
+
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS pronunciations (
+            id INTEGER PRIMARY KEY,
+            word_id INTEGER NOT NULL REFERENCES words (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            text TEXT,
+            audio TEXT
+        );
+        CREATE TABLE IF NOT EXISTS meanings (
+            id INTEGER PRIMARY KEY,
+            word_id INTEGER NOT NULL REFERENCES words (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            part_of_speech TEXT
+        );
+        CREATE TABLE IF NOT EXISTS definitions (
+            id INTEGER PRIMARY KEY,
+            meaning_id INTEGER NOT NULL REFERENCES meanings (id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            definition TEXT,
+            example TEXT
+        );
+        CREATE TABLE IF NOT EXISTS related_words (
+            id INTEGER PRIMARY KEY,
+            definition_id INTEGER NOT NULL REFERENCES definitions (id) ON DELETE CASCADE,
+            group_position INTEGER NOT NULL,
+            relationship_type TEXT,
+            word TEXT
+        );
+
+        CREATE INDEX IF NOT EXISTS pronunciations_word ON pronunciations (word_id);
+        CREATE INDEX IF NOT EXISTS meanings_word ON meanings (word_id);
+        CREATE INDEX IF NOT EXISTS meanings_part_of_speech ON meanings (part_of_speech);
+        CREATE INDEX IF NOT EXISTS definitions_meaning ON definitions (meaning_id);
+        CREATE INDEX IF NOT EXISTS related_words_definition ON related_words (definition_id);
+        CREATE INDEX IF NOT EXISTS related_words_word ON related_words (word, relationship_type);
+        """
+    )
+
+
+def _write_normalised(conn: Connection, entries: Iterable[Dict[str, Any]]) -> None:
+    """Replace the rows of the normalised tables of the (already saved) words :param entries"""
+    for entry in entries:
+        row = conn.execute(
+            "SELECT id FROM words WHERE name = ?", (entry["name"],)
+        ).fetchone()
+        if row is None:
+            # Not saved (e.g. edited after it was deleted or renamed), like edit_word: nothing to write
+            continue
+        (word_id,) = row
+
+        # Definitions and related words are deleted by cascade
+        conn.execute("DELETE FROM meanings WHERE word_id = ?", (word_id,))
+        conn.execute("DELETE FROM pronunciations WHERE word_id = ?", (word_id,))
+        conn.execute(
+            "UPDATE words SET etymology = ? WHERE id = ?",
+            (entry.get("etymology"), word_id),
+        )
+        conn.executemany(
+            """
+            INSERT INTO pronunciations (word_id, position, text, audio) VALUES (?, ?, ?, ?)
+            """,
+            (
+                (
+                    word_id,
+                    position,
+                    pronunciation.get("text"),
+                    pronunciation.get("audio"),
+                )
+                for position, pronunciation in enumerate(
+                    entry.get("pronunciations") or []
+                )
+            ),
+        )
+
+        for meaning_position, meaning in enumerate(entry.get("meanings") or []):
+            meaning_id = conn.execute(
+                """
+                INSERT INTO meanings (word_id, position, part_of_speech) VALUES (?, ?, ?)
+                """,
+                (word_id, meaning_position, meaning.get("part_of_speech")),
+            ).lastrowid
+
+            for definition_position, definition in enumerate(
+                meaning.get("definitions") or []
+            ):
+                definition_id = conn.execute(
+                    """
+                    INSERT INTO definitions (meaning_id, position, definition, example)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (
+                        meaning_id,
+                        definition_position,
+                        definition.get("definition"),
+                        definition.get("example"),
+                    ),
+                ).lastrowid
+
+                # A related words group without words is kept as a row with a NULL word (read back as [])
+                conn.executemany(
+                    """
+                    INSERT INTO related_words (definition_id, group_position, relationship_type, word)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (
+                        (
+                            definition_id,
+                            group_position,
+                            group.get("relationship_type"),
+                            word,
+                        )
+                        for group_position, group in enumerate(
+                            definition.get("related_words") or []
+                        )
+                        for word in (group.get("words") or [None])
+                    ),
+                )
+
+
+def _add_update_times(conn: Connection) -> None:
+    """Record when every word was last saved (in seconds since the epoch, 0 for the words saved before)"""
+    conn.execute(
+        """
+        ALTER TABLE words ADD COLUMN updated_at REAL NOT NULL DEFAULT 0
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX words_updated_at ON words (updated_at, id)
+        """
+    )
+
+
+def _add_change_numbers(conn: Connection) -> None:
+    """
+    Number the changes of the words: every save or edit takes the next number of the counter in the meta table,
+    in the transaction writing the word, so the numbers only ever increase (unlike the clock).
+    The words saved before are numbered in the order they were last saved.
+    """
+    conn.execute(
+        """
+        CREATE TABLE meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)
+        """
+    )
+    conn.execute(
+        """
+        ALTER TABLE words ADD COLUMN change INTEGER NOT NULL DEFAULT 0
+        """
+    )
+    conn.execute(
+        """
+        CREATE TEMP TABLE change_order (id INTEGER PRIMARY KEY, change INTEGER NOT NULL)
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO change_order
+        SELECT id, ROW_NUMBER() OVER (ORDER BY updated_at, id) FROM words
+        """
+    )
+    conn.execute(
+        """
+        UPDATE words SET change = (SELECT change FROM change_order WHERE id = words.id)
+        """
+    )
+    conn.execute(
+        """
+        DROP TABLE temp.change_order
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO meta (name, value) SELECT 'last_change', COUNT(*) FROM words
+        """
+    )
+    conn.execute(
+        """
+        DROP INDEX words_updated_at
+        """
+    )
+    conn.execute(
+        """
+        CREATE UNIQUE INDEX words_change ON words (change)
+        """
+    )
+
+
+def _take_change_numbers(conn: Connection, count: int) -> int:
+    """Take the next :param count change numbers (within the current transaction), returning the first one"""
+    conn.execute(
+        """
+        UPDATE meta SET value = value + ? WHERE name = 'last_change'
+        """,
+        (count,),
+    )
+    (last,) = conn.execute(
+        """
+        SELECT value FROM meta WHERE name = 'last_change'
+        """
+    ).fetchone()
+
+    return last - count + 1
+
+
+# Schema migrations, applied in order.
+# The schema version of a database (PRAGMA user_version) is the number of migrations applied to it.
+# Append new migrations at the end and never reorder or remove existing ones.
+MIGRATIONS: Sequence[Callable[[Connection], None]] = (
+    _create_full_text_index,
+    _add_unique_name_index,
+    _create_thesaurus,
+    _add_update_times,
+    _add_change_numbers,
+)
+
+
+def _fetch_in_batches(cursor: sqlite3.Cursor, size: int) -> Iterator[List[tuple]]:
+    """Yield the rows of :param cursor :param size at a time, stepping the statement as they are consumed"""
+    while rows := cursor.fetchmany(size):
+        yield rows
+
+
+def migrate(conn: Connection) -> None:
+    """Apply the migrations the database has not had yet, within the current transaction"""
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+
+    for version, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration(conn)
+        conn.execute(f"PRAGMA user_version = {version}")
+
+
+class ConnectionPool:
+    """
+    Long-lived connections to a database file, one per thread, shared by every Database using that file.
+
+    Connections are opened once and tuned for an interactive app: the journal is in WAL mode,
+    so readers in background threads do not block the writer (and vice versa).
+    The connections of threads which have ended are closed when another thread connects.
+    """
+
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        # Safe with WAL: only the last transactions can be lost, on power failure
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # Negative values are in KiB
+        "foreign_keys": "ON",
+    }
+
+    _pools: Dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, url: Union[Path, str]) -> None:
+        self._url = url
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, Connection] = {}
+        self._lock = threading.Lock()
+        self.schema_is_ready = False
+
+    @classmethod
+    def shared(cls, url: Union[Path, str]) -> "ConnectionPool":
+        """Return the pool of the database file at :param url, creating it the first time"""
+        key = str(Path(url).resolve())
+
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = cls(url)
+            return cls._pools[key]
+
+    def connection(self) -> Connection:
+        """Return the connection of the current thread"""
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            # Each connection is only used by its thread, but may be closed by another one
+            connection = sqlite3.connect(self._url, check_same_thread=False)
+            for pragma, value in self.PRAGMAS.items():
+                connection.execute(f"PRAGMA {pragma} = {value}")
+
+            self._local.connection = connection
+            with self._lock:
+                for thread in [
+                    thread for thread in self._connections if not thread.is_alive()
+                ]:
+                    self._connections.pop(thread).close()
+                self._connections[threading.current_thread()] = connection
+
+        return connection
+
+    def close(self) -> None:
+        """Close the connections of every thread. They are opened again when next used"""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        """Number of open connections"""
+        return len(self._connections)
 
 
 class Database:
@@ -16,48 +528,84 @@ class Database:
 
     When another approach is used (such as instantiation), commits and rollbacks should be done manually.
 
-    The connection to the database is closed when
+    Database files are accessed through a shared ConnectionPool, so creating a Database is cheap
+    and its connections stay open for the lifetime of the app.
+    In-memory databases have their own connection, which is closed when
     the context manager is exited or all references to the instance of the database are deleted
     """
 
     def __init__(
         self,
         url: Union[Path, str] = (DATABASE_DIRECTORY / DATABASE_NAME),
+        codec: EntryCodec = DEFAULT_CODEC,
     ) -> None:
+        """
+        :param codec: Encoding of the words saved: BinaryCodec by default, whose entries are smaller and decode
+            faster than JSON. Words in the other supported encodings still load, and convert_rows re-encodes them
+        """
         self._url = url
+        self._codec = codec
         self._connection: Optional[Connection] = None
-        self.create_words_database_if_not_exist()
+        self._pool: Optional[ConnectionPool] = (
+            None if str(url) == ":memory:" else ConnectionPool.shared(url)
+        )
+
+        if self._pool is None or not self._pool.schema_is_ready:
+            self.create_words_database_if_not_exist()
+
+            if self._pool is not None:
+                self._pool.schema_is_ready = True
 
     def _connect(self) -> None:
         self._connection = sqlite3.connect(self._url)
+        self._connection.execute("PRAGMA foreign_keys = ON")
 
     def get_connection(self) -> Connection:
         """Return a database connection"""
+        if self._pool is not None:
+            return self._pool.connection()
+
         if not self._connection:
             self._connect()
         return self._connection
 
     def close_connection(self) -> None:
-        """Close the database connection"""
+        """Close the database connection (pooled connections stay open)"""
         if self._connection:
             self._connection.close()
 
+    def close(self) -> None:
+        """
+        Close the connections to the database, pooled connections included,
+        e.g. when the app exits. They are opened again if the database is used afterwards.
+        """
+        self.close_connection()
+        self._connection = None
+
+        if self._pool is not None:
+            self._pool.close()
+
     def __del__(self) -> None:
         """Close the database connection when there are no references to it"""
-        self.close_connection()
+        try:
+            self.close_connection()
+        except sqlite3.ProgrammingError:
+            # Collected in another thread: the connection is closed when it is freed
+            pass
         self._connection = None
 
     def __enter__(self):
-        self._connect()
+        self.get_connection()
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
         if exc_traceback is None:
-            self._connection.commit()
+            self.get_connection().commit()
         else:
-            self._connection.rollback()
+            self.get_connection().rollback()
 
         self.close_connection()
+        self._connection = None
 
     def create_words_database_if_not_exist(self) -> None:
         with self.get_connection() as conn:
@@ -70,6 +618,57 @@ class Database:
                 )
                 """
             )
+            migrate(conn)
+
+    @property
+    def codec(self) -> EntryCodec:
+        return self._codec
+
+    def _encode(self, entry: Dict[str, Any]) -> Union[str, bytes]:
+        return encode_entry(entry, self._codec)
+
+    def convert_rows(
+        self, batch_size: int = 500, interrupted: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """
+        Re-encode the words stored in another format (e.g. JSON rows from older versions) with the codec
+        of this database, one transaction per batch so it can run in the background.
+        :param interrupted: Checked before every batch, the conversion stops (to go on later) once it returns True
+        Return the number of words converted.
+        """
+        converted = 0
+        last_id = 0
+        conn = self.get_connection()
+
+        while interrupted is None or not interrupted():
+            with conn:
+                rows = conn.execute(
+                    """
+                    SELECT id, data FROM words WHERE typeof(data) != ? AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    (self._codec.storage_class, last_id, batch_size),
+                ).fetchall()
+
+                if not rows:
+                    return converted
+
+                # Skip rows edited since they were read
+                conn.executemany(
+                    """
+                    UPDATE words SET data = ? WHERE id = ? AND data = ?
+                    """,
+                    (
+                        (self._encode(decode_entry(data)), row_id, data)
+                        for row_id, data in rows
+                    ),
+                )
+
+            converted += len(rows)
+            last_id = rows[-1][0]
+
+        return converted
 
     def fetch_all_words(self) -> Generator[Optional[BaseAPI], Any, None]:
         """Yield all word data (BaseAPI) found in the database, if any"""
@@ -79,23 +678,162 @@ class Database:
             """
         ):
             yield [
-                loads(row[0]),
+                decode_entry(row[0]),
             ]
 
-    def save_word(self, word_data: BaseAPI) -> None:
-        """Save a word to the database"""
-        word_data = word_data[0]
-        with self.get_connection() as conn:
-            conn.execute(
+    def fetch_word_names(self) -> Generator[Tuple[int, str], Any, None]:
+        """
+        Yield the row id and name of every word in the database, sorted by name, without loading their data.
+        The rows are read from the index on names.
+        """
+        yield from self.get_connection().execute(
+            """
+            SELECT id, name FROM words ORDER BY name
+            """
+        )
+
+    def count_words(self) -> int:
+        (count,) = (
+            self.get_connection()
+            .execute(
+                """
+                SELECT COUNT(*) FROM words
+                """
+            )
+            .fetchone()
+        )
+        return count
+
+    def iter_names(self, batch_size: int = 1000) -> Iterator[str]:
+        """
+        Yield the name of every word, in sorted order, without reading their data.
+        The names are read from the index on names, :param batch_size rows at a time.
+        """
+        cursor = self.get_connection().execute(
+            """
+            SELECT name FROM words ORDER BY name
+            """
+        )
+        for rows in _fetch_in_batches(cursor, batch_size):
+            yield from (name for (name,) in rows)
+
+    def iter_words(
+        self, offset: int = 0, limit: Optional[int] = None, batch_size: int = 100
+    ) -> Iterator[BaseAPI]:
+        """Yield the word data (BaseAPI) of (at most :param limit) words sorted by name, skipping the first :param offset"""
+        cursor = self.get_connection().execute(
+            """
+            SELECT data FROM words ORDER BY name LIMIT ? OFFSET ?
+            """,
+            (-1 if limit is None else limit, offset),
+        )
+        for rows in _fetch_in_batches(cursor, batch_size):
+            yield from ([decode_entry(data)] for (data,) in rows)
+
+    def iter_changed_since(
+        self, change: int = 0, batch_size: int = 1000
+    ) -> Iterator[Tuple[int, int, str, float]]:
+        """
+        Yield the (change number, row id, name, update time) of the words saved or edited after :param change,
+        oldest change first, without reading their data.
+
+        Pass the change number of the last row seen to resume where a previous call stopped.
+        Change numbers only increase, whatever the clock does, and the update time is for information only.
+        Deleted words are not reported.
+        """
+        cursor = self.get_connection().execute(
+            """
+            SELECT change, id, name, updated_at FROM words
+            WHERE change > ?
+            ORDER BY change
+            """,
+            (change,),
+        )
+        for rows in _fetch_in_batches(cursor, batch_size):
+            yield from rows
+
+    def iter_in_batches(self, size: int = 500) -> Iterator[List[BaseAPI]]:
+        """Yield the word data (BaseAPI) of every word, in lists of (at most) :param size words"""
+        cursor = self.get_connection().execute(
+            """
+            SELECT data FROM words
+            """
+        )
+        for rows in _fetch_in_batches(cursor, size):
+            yield [[decode_entry(data)] for (data,) in rows]
+
+    def fetch_word(self, row_id: int) -> Optional[BaseAPI]:
+        """Return the word data (BaseAPI) stored at :param row_id, if any"""
+        row = (
+            self.get_connection()
+            .execute(
                 """
-                INSERT INTO words (name, data)
-                VALUES (?, ?)
+                SELECT data FROM words WHERE id = ?
                 """,
-                (
-                    word_data["name"],
-                    dumps(word_data),
-                ),
+                (row_id,),
             )
+            .fetchone()
+        )
+
+        return [decode_entry(row[0])] if row else None
+
+    def save_word(self, word_data: BaseAPI) -> None:
+        """Save a word to the database, replacing any word with the same name"""
+        self.save_words((word_data,))
+
+    def save_words(
+        self,
+        words: Iterable[BaseAPI],
+        batch_size: int = 1000,
+        encoded: Optional[Iterable[Union[str, bytes]]] = None,
+    ) -> int:
+        """
+        Save many words (replacing any word with the same name) in a single transaction,
+        writing them :param batch_size at a time. Return the number of words saved.
+        :param encoded: The words already encoded with the codec of the database (e.g. by other processes), in order
+        """
+        saved = 0
+        encoded = iter(encoded) if encoded is not None else None
+        with self.get_connection() as conn:
+            normalised = _is_normalised(conn)
+            words = iter(words)
+            while batch := [word_data[0] for word_data in islice(words, batch_size)]:
+                data = (
+                    islice(encoded, len(batch))
+                    if encoded is not None
+                    else map(self._encode, batch)
+                )
+                # A word repeated in the batch is written (and indexed) once, with its last data
+                rows = {
+                    entry["name"]: (entry, entry_data)
+                    for (entry, entry_data) in zip(batch, data)
+                }
+                batch = [entry for (entry, _) in rows.values()]
+                updated_at = time()
+                first_change = _take_change_numbers(conn, len(rows))
+                conn.executemany(
+                    """
+                    INSERT INTO words (name, data, updated_at, change)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE
+                    SET data = excluded.data,
+                        updated_at = excluded.updated_at,
+                        change = excluded.change
+                    """,
+                    (
+                        (name, entry_data, updated_at, change)
+                        for (change, (name, (_, entry_data))) in enumerate(
+                            rows.items(), start=first_change
+                        )
+                    ),
+                )
+                _reindex_texts(conn, batch)
+                _reindex_thesaurus(conn, batch)
+                if normalised:
+                    _write_normalised(conn, batch)
+                saved += len(batch)
+
+        return saved
 
     def edit_word(self, word_data: BaseAPI) -> None:
         word_data = word_data[0]
@@ -103,21 +841,241 @@ class Database:
             conn.execute(
                 """
                 UPDATE words
-                SET data = ?
+                SET data = ?, updated_at = ?, change = ?
                 WHERE name = ?
                 """,
                 (
-                    dumps(word_data),
+                    self._encode(word_data),
+                    time(),
+                    _take_change_numbers(conn, 1),
                     word_data["name"],
                 ),
             )
+            _reindex_texts(conn, (word_data,))
+            _reindex_thesaurus(conn, (word_data,))
+
+            if _is_normalised(conn):
+                _write_normalised(conn, (word_data,))
+
+    def import_jsonl(self, path: Union[Path, str], batch_size: int = 1000) -> int:
+        """
+        Save the words of a JSON Lines file, holding one word (BaseAPI or a single entry of it) per line.
+        The file is streamed, and all its words are saved in a single transaction.
+        Return the number of words saved.
+        """
+
+        def read_words(file) -> Generator[BaseAPI, Any, None]:
+            for line in file:
+                if line.strip():
+                    word_data = loads(line)
+                    yield word_data if isinstance(word_data, list) else [word_data]
+
+        with open(path, encoding="utf-8") as file:
+            return self.save_words(read_words(file), batch_size=batch_size)
+
+    def export_jsonl(self, path: Union[Path, str]) -> int:
+        """
+        Write every word to a JSON Lines file (one BaseAPI entry per line, sorted by name),
+        streaming the rows. Return the number of words written.
+        """
+        exported = 0
+        with open(path, "w", encoding="utf-8") as file:
+            for (data,) in self.get_connection().execute(
+                """
+                SELECT data FROM words ORDER BY name
+                """
+            ):
+                file.write(dumps(decode_entry(data), ensure_ascii=False) + "\n")
+                exported += 1
+
+        return exported
 
     def delete_word(self, word: str) -> None:
         """Removes a word from database. Warning: Destructive action"""
         with self.get_connection() as conn:
+            _unindex_text(conn, word)
             conn.execute(
                 """
                 DELETE FROM words WHERE name = (?)
                 """,
                 (word,),
             )
+
+    def normalise(self) -> int:
+        """
+        Store the words in the normalised schema too (one-shot migration), and keep it up to date from then on.
+
+        The normalised schema spreads every word over relational tables (words, pronunciations, meanings,
+        definitions and related_words) with foreign keys and indexes, so questions such as
+        "which words are nouns" are answered without decoding any word.
+        Fields outside the BaseAPI format are not kept there, and missing (None) lists of related words are read back empty.
+        Return the number of words migrated.
+        """
+        with self.get_connection() as conn:
+            _create_normalised_tables(conn)
+            entries = [
+                decode_entry(data)
+                for (data,) in conn.execute("SELECT data FROM words").fetchall()
+            ]
+            _write_normalised(conn, entries)
+
+        return len(entries)
+
+    def fetch_word_normalised(self, word: str) -> Optional[BaseAPI]:
+        """Rebuild the word data (BaseAPI) of :param word from the normalised schema, if present"""
+        conn = self.get_connection()
+        row = conn.execute(
+            "SELECT id, name, etymology FROM words WHERE name = ?", (word,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        word_id, name, etymology = row
+        pronunciations = [
+            {"text": text, "audio": audio}
+            for text, audio in conn.execute(
+                """
+                SELECT text, audio FROM pronunciations WHERE word_id = ? ORDER BY position
+                """,
+                (word_id,),
+            )
+        ]
+
+        meanings = []
+        for meaning_id, part_of_speech in conn.execute(
+            """
+            SELECT id, part_of_speech FROM meanings WHERE word_id = ? ORDER BY position
+            """,
+            (word_id,),
+        ).fetchall():
+            definitions = []
+
+            for definition_id, definition, example in conn.execute(
+                """
+                SELECT id, definition, example FROM definitions
+                WHERE meaning_id = ?
+                ORDER BY position
+                """,
+                (meaning_id,),
+            ).fetchall():
+                related_words: Dict[int, Dict[str, Any]] = {}
+
+                for group_position, relationship_type, related_word in conn.execute(
+                    """
+                    SELECT group_position, relationship_type, word FROM related_words
+                    WHERE definition_id = ?
+                    ORDER BY group_position, id
+                    """,
+                    (definition_id,),
+                ):
+                    group = related_words.setdefault(
+                        group_position,
+                        {"relationship_type": relationship_type, "words": []},
+                    )
+                    if related_word is not None:
+                        group["words"].append(related_word)
+
+                definitions.append(
+                    {
+                        "definition": definition,
+                        "example": example,
+                        "related_words": list(related_words.values()),
+                    }
+                )
+
+            meanings.append(
+                {"part_of_speech": part_of_speech, "definitions": definitions}
+            )
+
+        return [
+            {
+                "name": name,
+                "pronunciations": pronunciations,
+                "etymology": etymology,
+                "meanings": meanings,
+            }
+        ]
+
+    def find_words_by_part_of_speech(self, part_of_speech: str) -> List[str]:
+        """Return the (sorted) names of the words with a meaning of :param part_of_speech. Requires normalise()"""
+        return [
+            name
+            for (name,) in self.get_connection().execute(
+                """
+                SELECT DISTINCT words.name FROM meanings
+                JOIN words ON words.id = meanings.word_id
+                WHERE meanings.part_of_speech = ?
+                ORDER BY words.name
+                """,
+                (part_of_speech,),
+            )
+        ]
+
+    def find_words_with_related_word(
+        self,
+        related_word: str,
+        relationship_type: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Return the (sorted) names of the words listing :param related_word as a related word,
+        e.g. all the words whose synonyms include it. Requires normalise()
+        """
+        return [
+            name
+            for (name,) in self.get_connection().execute(
+                """
+                SELECT DISTINCT words.name FROM related_words
+                JOIN definitions ON definitions.id = related_words.definition_id
+                JOIN meanings ON meanings.id = definitions.meaning_id
+                JOIN words ON words.id = meanings.word_id
+                WHERE related_words.word = ?1 AND (?2 IS NULL OR related_words.relationship_type = ?2)
+                ORDER BY words.name
+                """,
+                (related_word, relationship_type),
+            )
+        ]
+
+    def find_related(
+        self, term: str, relationship_type: Optional[str] = None
+    ) -> List[ThesaurusEntry]:
+        """
+        Return where :param term is listed as a related word (e.g. every word it is a synonym of),
+        optionally only as :param relationship_type, sorted by word
+        """
+        return [
+            ThesaurusEntry(*row)
+            for row in self.get_connection().execute(
+                """
+                SELECT words.name, thesaurus.meaning, thesaurus.definition, thesaurus.relationship_type
+                FROM thesaurus
+                JOIN words ON words.id = thesaurus.word_id
+                WHERE thesaurus.term = ?1 AND (?2 IS NULL OR thesaurus.relationship_type = ?2)
+                ORDER BY words.name, thesaurus.rowid
+                """,
+                (term.lower(), relationship_type),
+            )
+        ]
+
+    def search_text(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Return the names of the words whose name, definitions, examples or etymology match :param query,
+        best matches (by BM25) first.
+        The last term of the query is matched as a prefix, so results can be shown as the user types.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        rows = self.get_connection().execute(
+            """
+            SELECT name FROM words_fts
+            WHERE words_fts MATCH ?
+            ORDER BY bm25(words_fts, 10.0, 1.0, 0.5, 0.25)
+            LIMIT ?
+            """,
+            (match, limit),
+        )
+
+        return list(dict.fromkeys(name for (name,) in rows))
@@ -1,9 +1,25 @@
+from concurrent.futures import Future
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Optional, Sequence, Union
-
-from PyQt5.QtCore import Qt
+from typing import Any, Dict, List, Optional, Set, Union
+
+from PyQt5.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    QThread,
+    QTimer,
+    pyqtSignal,
+)
 from PyQt5.QtGui import QGuiApplication, QIcon
-from PyQt5.QtWidgets import QDialog, QGroupBox, QMainWindow, QMessageBox
+from PyQt5.QtWidgets import (
+    QDialog,
+    QGroupBox,
+    QInputDialog,
+    QMainWindow,
+    QMessageBox,
+)
 
 from .add_word_dialog import Ui_AddWordDialog as UiAddWordDialog
 from .definition_groupbox import Ui_DefinitionGroupBox as UiDefinitionGroupBox
@@ -11,9 +27,19 @@ from .mainwindow import Ui_MainWindow as UiMainWindow
 from .meanings_groupbox import Ui_MeaningsGroupBox as UiMeaningsGroupBox
 from .pronunciation_groupbox import Ui_Pronunciation as UiPronunciationGroupBox
 from .related_words_groupbox import Ui_RelatedWordsGroupBox as UiRelatedWordsGroupBox
-from ..api import BaseAPI
-from ..core import Definition, Dictionary, Meaning, Pronunciation, RelatedWord, WordData
+from ..api import BaseAPI, LookupClient, WordNotFound
+from ..cache import CACHE_NAME, ResponseCache
+from ..core import (
+    Definition,
+    Dictionary,
+    Meaning,
+    Pronunciation,
+    RelatedWord,
+    WordData,
+    WordStub,
+)
 from ..database import DATABASE_DIRECTORY, DATABASE_NAME, Database
+from ..utils.formatter import RenderCache, render_word
 
 SVGS_DIR = Path(__file__).resolve().parent / "svgs"
 PLUS_SVG_PATH = SVGS_DIR / "plus.svg"
@@ -21,6 +47,11 @@ SEARCH_SVG_PATH = SVGS_DIR / "search.svg"
 EDIT_SVG_PATH = SVGS_DIR / "edit.svg"
 DELETE_SVG_PATH = SVGS_DIR / "trash-alt.svg"
 
+# Maximum number of matches shown in the word list while searching
+SEARCH_RESULTS_LIMIT = 200
+# Maximum number of "did you mean" suggestions offered before fetching a word from the internet
+SUGGESTIONS_LIMIT = 5
+
 plus_icon = QIcon(str(PLUS_SVG_PATH))
 
 
@@ -344,11 +375,204 @@ class EditWordDialog(AddWordDialog):
             self._next_meaning_widget_index += 1
 
 
+class WordListModel(QAbstractListModel):
+    """
+    Names shown in the word list: every word of the (sorted) dictionary, or the matches of a search.
+
+    Rows are read straight from the dictionary, so no item is created per word,
+    and they are exposed to the view a page at a time (canFetchMore/fetchMore) as it scrolls.
+    """
+
+    PAGE_SIZE = 500
+
+    def __init__(self, dictionary: Dictionary, *args, **kwargs) -> None:
+        super(WordListModel, self).__init__(*args, **kwargs)
+        self._dictionary = dictionary
+        self._matches: Optional[List[str]] = None
+        self._fetched = 0
+
+    def _size(self) -> int:
+        return len(self._dictionary) if self._matches is None else len(self._matches)
+
+    def name(self, row: int) -> str:
+        """Return the word shown at :param row"""
+        if self._matches is None:
+            return self._dictionary[row].get_name()
+
+        return self._matches[row]
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and index.isValid():
+            return self.name(index.row())
+
+        return None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self._fetched < self._size()
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        count = min(self.PAGE_SIZE, self._size() - self._fetched)
+        if parent.isValid() or count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def show_matches(self, matches: Optional[List[str]]) -> None:
+        """Show only :param matches, or the whole dictionary if None"""
+        self.beginResetModel()
+        self._matches = matches
+        # The first page is shown right away, the rest as the view scrolls
+        self._fetched = min(self.PAGE_SIZE, self._size())
+        self.endResetModel()
+
+    def row(self, name: str) -> Optional[int]:
+        """Return the row of the word :param name, fetching the rows up to it, or None if it is not shown"""
+        if self._matches is None:
+            if name not in self._dictionary:
+                return None
+            row = self._dictionary.insertion_index(WordData(name))
+        elif name in self._matches:
+            row = self._matches.index(name)
+        else:
+            return None
+
+        if row >= self._fetched:
+            self.beginInsertRows(QModelIndex(), self._fetched, row)
+            self._fetched = row + 1
+            self.endInsertRows()
+
+        return row
+
+    def add_words(self, words: List[WordData]) -> None:
+        """Add many words at once (e.g. a chunk loaded from the database) to the dictionary"""
+        if not words:
+            return
+
+        size = self._size()
+        appended = not self._dictionary or self._dictionary[-1] < min(words)
+
+        if self._matches is not None or appended:
+            # The rows fetched so far are unchanged
+            self._dictionary.extend_sorted(words)
+            if self._matches is None and self._fetched == size:
+                self.fetchMore(QModelIndex())
+            return
+
+        self.beginResetModel()
+        self._dictionary.extend_sorted(words)
+        self._fetched = min(max(self._fetched, self.PAGE_SIZE), self._size())
+        self.endResetModel()
+
+    def add_word(self, word_data: WordData) -> None:
+        """Add :param word_data to the dictionary, inserting its row if it is among the rows fetched"""
+        row = self._dictionary.insertion_index(word_data)
+        shown = (
+            self._matches is None
+            and word_data not in self._dictionary
+            and row < self._fetched
+        )
+
+        if shown:
+            self.beginInsertRows(QModelIndex(), row, row)
+        self._dictionary.append(word_data)
+        if shown:
+            self._fetched += 1
+            self.endInsertRows()
+
+    def remove_word(self, word_data: WordData) -> None:
+        """Remove :param word_data from the dictionary and from the rows shown"""
+        if self._matches is None:
+            row = self._dictionary.index(word_data)
+        elif word_data.get_name() in self._matches:
+            row = self._matches.index(word_data.get_name())
+        else:
+            row = None
+
+        shown = row is not None and row < self._fetched
+        if shown:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        self._dictionary.remove(word_data)
+        if self._matches is not None and row is not None:
+            del self._matches[row]
+        if shown:
+            self._fetched -= 1
+            self.endRemoveRows()
+
+    def replace_word(self, old: WordData, new: WordData) -> None:
+        self.remove_word(old)
+        self.add_word(new)
+
+
+class WordLoader(QThread):
+    """Read the names of the stored words in the background, in sorted order, a chunk at a time"""
+
+    CHUNK_SIZE = 5000
+
+    # A chunk of WordStub
+    words_loaded = pyqtSignal(list)
+    # The number of words loaded so far and the total
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, database: Database, *args, **kwargs) -> None:
+        super(WordLoader, self).__init__(*args, **kwargs)
+        self._database = database
+
+    def run(self) -> None:
+        total = self._database.count_words()
+        rows = self._database.fetch_word_names()
+        loaded = 0
+
+        while not self.isInterruptionRequested() and (
+            chunk := [
+                WordStub(name, row_id) for row_id, name in islice(rows, self.CHUNK_SIZE)
+            ]
+        ):
+            loaded += len(chunk)
+            self.words_loaded.emit(chunk)
+            self.progress.emit(loaded, total)
+
+
+class RowConverter(QThread):
+    """Re-encode the words stored in an older format in the background, see Database.convert_rows"""
+
+    def __init__(self, database: Database, *args, **kwargs) -> None:
+        super(RowConverter, self).__init__(*args, **kwargs)
+        self._database = database
+
+    def run(self) -> None:
+        self._database.convert_rows(interrupted=self.isInterruptionRequested)
+
+
+class LookupSignals(QObject):
+    """Carries the lookups done by the worker threads of LookupClient back to the GUI thread"""
+
+    # The word looked up and the Future of its data
+    finished = pyqtSignal(str, object)
+
+
 class MainWindow(QMainWindow, UiMainWindow):
     def __init__(self, *args, **kwargs):
         super(MainWindow, self).__init__(*args, **kwargs)
-        self.dictionary = Dictionary()
+        self.database = Database(DATABASE_DIRECTORY / DATABASE_NAME)
+        self.dictionary = Dictionary(
+            loader=self.load_word, thesaurus=self.database.find_related
+        )
+        self.word_list = WordListModel(self.dictionary)
+        self.rendered_words = RenderCache()
+        # Renders the words next to the one displayed once the app is idle, for arrow-key navigation
+        self.prerender_timer = QTimer(self, singleShot=True, interval=0)
+        self.lookup_client = LookupClient(
+            cache=ResponseCache(DATABASE_DIRECTORY / CACHE_NAME)
+        )
+        self.lookups = LookupSignals()
+        self.pending_lookups: Set[str] = set()
         self.setupUi(self)
+        self.list_view.setModel(self.word_list)
         self.add_button.setIcon(plus_icon)
         self.delete_button.setIcon(QIcon(str(DELETE_SVG_PATH)))
         self.delete_button.setStyleSheet("background:red")
@@ -357,10 +581,7 @@ class MainWindow(QMainWindow, UiMainWindow):
         self.install_slots()
         QGuiApplication.setFallbackSessionManagementEnabled(False)
         self.setUnifiedTitleAndToolBarOnMac(True)
-        self.update_dictionary(self.dictionary.peek())
-        self.fill_with_dummy_data()
-        self.list_widget.sortItems(Qt.AscendingOrder)
-        self.list_widget.setCurrentItem(self.list_widget.item(0))
+        self.load_words_in_background()
         self.show()
 
     def add_word_handler(self) -> None:
@@ -368,23 +589,18 @@ class MainWindow(QMainWindow, UiMainWindow):
         dialog = AddWordDialog()
         if dialog.exec_() == QDialog.Accepted:
             if result := dialog.get_results():
-                self.dictionary.append(WordData.from_api(result))
-                with Database(DATABASE_DIRECTORY / DATABASE_NAME) as db:
-                    db.save_word(result)
-                self.update_dictionary(
-                    [
-                        WordData.from_api(result).get_name(),
-                    ]
-                )
+                self.store_word(result)
 
     def install_slots(self) -> None:
         self.search_bar.textChanged.connect(self.filter_displayed_words)
         self.search_bar.returnPressed.connect(self.fetch_word_from_internet)
         self.search_button.clicked.connect(self.fetch_word_from_internet)
+        self.lookups.finished.connect(self.add_fetched_word)
 
         self.add_button.clicked.connect(self.add_word_handler)
 
-        self.list_widget.currentItemChanged.connect(self.display_detail)
+        self.list_view.selectionModel().currentChanged.connect(self.display_detail)
+        self.prerender_timer.timeout.connect(self.prerender_neighbours)
 
         self.edit_button.clicked.connect(self.edit_word)
 
@@ -392,58 +608,91 @@ class MainWindow(QMainWindow, UiMainWindow):
 
     def filter_displayed_words(self, text: str) -> None:
         """Perform real time filtering of words as the user is typing"""
-        for widget in self.list_widget.findItems("", Qt.MatchContains):
-            if widget in self.list_widget.findItems(text, Qt.MatchContains):
-                widget.setHidden(False)
-            else:
-                widget.setHidden(True)
+        text = text.strip().lower()
+        current = self.current_word()
+
+        if text:
+            # Words starting with the text come first, followed by those merely containing it
+            matches = self.dictionary.complete(text, limit=SEARCH_RESULTS_LIMIT)
+            matches.extend(
+                word
+                for word in self.dictionary.search_contains(
+                    text, limit=SEARCH_RESULTS_LIMIT + len(matches)
+                )
+                if not word.startswith(text)
+            )
+            self.word_list.show_matches(matches[:SEARCH_RESULTS_LIMIT])
+        else:
+            self.word_list.show_matches(None)
+
+        # Resetting the rows clears the current index without emitting currentChanged
+        if current is not None and (row := self.word_list.row(current)) is not None:
+            self.list_view.setCurrentIndex(self.word_list.index(row))
+        else:
+            self.display_detail()
+
+    def refresh_matches(self) -> None:
+        """Search the words shown again (e.g. after a word is added), if they are the matches of a search"""
+        if text := self.search_bar.text().strip():
+            self.filter_displayed_words(text)
+
+    def current_word(self) -> Optional[str]:
+        """Return the word selected in the word list, if any"""
+        index = self.list_view.currentIndex()
+        return self.word_list.name(index.row()) if index.isValid() else None
 
     def edit_word(self) -> None:
-        text = self.list_widget.currentItem().text()
+        if (text := self.current_word()) is None:
+            return
+
         word = self.fetch_word(text)
 
         dialog = EditWordDialog(word_data=word)
         if dialog.exec_() == QDialog.Accepted:
             if result := dialog.get_results():
-                self.dictionary.edit_word(word, WordData.from_api(result))
-                with Database(DATABASE_DIRECTORY / DATABASE_NAME) as db:
-                    db.edit_word(result)
-                    self.update_dictionary(
-                        [
-                            WordData.from_api(result).get_name(),
-                        ]
-                    )
-
-    def update_dictionary(self, words: Sequence[str]) -> None:
-        """Update the UI"""
-        for word in words:
-            if self.list_widget.findItems(word, Qt.MatchExactly):
-                continue
-            self.list_widget.addItem(word)
-        self.list_widget.sortItems(Qt.AscendingOrder)
+                self.database.edit_word(result)
+                self.rendered_words.discard(text)
+                self.word_list.replace_word(word, WordData.from_api(result))
+                self.refresh_matches()
 
     def delete_word(self) -> None:
         """Remove a word from the dictionary"""
-        word = self.list_widget.currentItem().text()
-        with Database(DATABASE_DIRECTORY / DATABASE_NAME) as db:
-            db.delete_word(word)
-        self.dictionary.remove(self.dictionary.get_word_details(word))
-        self.list_widget.takeItem(self.list_widget.row(self.list_widget.currentItem()))
+        if (word := self.current_word()) is None:
+            return
+
+        self.database.delete_word(word)
+        self.rendered_words.discard(word)
+        # Words are compared by name, so the details of the word need not be loaded
+        self.word_list.remove_word(WordData(word))
 
     def display_detail(self) -> None:
         """Display details of a word in the dictionary"""
-        if len(self.list_widget.findItems("", Qt.MatchContains)) == 1:
+        if (word := self.current_word()) is None:
             self.text_browser.clear()
             self.edit_button.setVisible(False)
             return
 
-        text = self.parse_word_data(self.list_widget.currentItem().text())
+        text = self.parse_word_data(word)
         self.text_browser.setHtml(text)
-        self.list_widget.sortItems(Qt.AscendingOrder)
 
         if not self.edit_button.isVisible():
             self.edit_button.setVisible(True)
 
+        self.prerender_timer.start()
+
+    def prerender_neighbours(self) -> None:
+        """Render the words around the one displayed, so moving to them does not wait for their details"""
+        row = self.list_view.currentIndex().row()
+
+        for neighbour in (row + 1, row - 1):
+            if 0 <= neighbour < self.word_list.rowCount():
+                self.parse_word_data(self.word_list.name(neighbour))
+
+    def select_word(self, word: str) -> None:
+        """Show a word of the dictionary in the word list and display its details"""
+        self.search_bar.setText(word)
+        self.list_view.setCurrentIndex(self.word_list.index(0))
+
     def fetch_word(self, word: str) -> WordData:
         """Returns a word with its details from the dictionary with the word's name alone"""
         return self.dictionary.get_word_details(word)
@@ -452,9 +701,23 @@ class MainWindow(QMainWindow, UiMainWindow):
         """Fetch word from internet if not present in storage"""
         text = self.search_bar.text().strip().lower()
 
-        if text in self.dictionary.peek():
+        if text in self.dictionary:
             return
 
+        if suggestions := self.dictionary.suggest(text, limit=SUGGESTIONS_LIMIT):
+            suggestion, accepted = QInputDialog.getItem(
+                self,
+                self.windowTitle(),
+                f"The word '{text}' is not in your dictionary. Did you mean:",
+                suggestions,
+                0,
+                False,
+            )
+
+            if accepted:
+                self.select_word(suggestion)
+                return
+
         message_box = QMessageBox()
         message_box.setText(
             f"The word '{text}' is not in your dictionary at the moment"
@@ -464,50 +727,135 @@ class MainWindow(QMainWindow, UiMainWindow):
 
         response = message_box.exec_()
 
-        if response == QMessageBox.No:
+        if response == QMessageBox.No or text in self.pending_lookups:
             return
 
-        from ..api import FreeDictionaryApi, BaseAPIBuilder
+        # The word is added by add_fetched_word once fetched, the UI stays responsive meanwhile
+        self.pending_lookups.add(text)
+        self.statusBar().showMessage(f"Fetching '{text}'...")
+        self.lookup_client.lookup(
+            text, callback=lambda future: self.lookups.finished.emit(text, future)
+        )
+
+    def add_fetched_word(self, text: str, future: Future) -> None:
+        """Store a word fetched from the internet and show it in the word list"""
+        self.pending_lookups.discard(text)
 
-        parser = FreeDictionaryApi()
+        if future.cancelled():
+            return
 
         try:
-            word = parser.get_json(text)
-        except Exception:
+            word = future.result()
+        except Exception as error:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+            if isinstance(error, WordNotFound):
+                reason = "The word was not found"
+            elif status_code == 429:
+                reason = "Too many words were requested, wait a moment and try again"
+            else:
+                reason = "Check your internet connection and try again"
+
+            self.statusBar().clearMessage()
             message = QMessageBox.critical(
                 None,
                 self.windowTitle(),
-                "Could not fetch word\nCheck your internet connection and try again",
+                f"Could not fetch '{text}'\n{reason}",
             )
             return
 
-        word = BaseAPIBuilder.from_free_dictionary_api(word)
-        with Database(DATABASE_DIRECTORY / DATABASE_NAME) as db:
-            db.save_word(word)
-        word_data = WordData.from_api(word)
-        self.dictionary.append(word_data)
-        self.update_dictionary(
-            [
-                word_data.get_name(),
-            ]
+        if self.store_word(word):
+            self.statusBar().showMessage(f"'{text}' was added to your dictionary", 5000)
+        else:
+            self.statusBar().clearMessage()
+
+    def store_word(self, word_data: BaseAPI) -> bool:
+        """
+        Save a new word and show it in the word list. Saving replaces a stored word with the same name,
+        so that is only done once the user confirms it. Return whether the word was saved.
+        """
+        name = word_data[0]["name"]
+
+        if name not in self.dictionary:
+            self.database.save_word(word_data)
+            self.word_list.add_word(WordData.from_api(word_data))
+            self.refresh_matches()
+            return True
+
+        response = QMessageBox.question(
+            self,
+            self.windowTitle(),
+            f"The word '{name}' is already in your dictionary. Do you want to replace it?",
         )
+        if response != QMessageBox.Yes:
+            return False
 
-    def parse_word_data(self, word: str) -> str:
-        """Convert a word (with name alone) into HTML with all its details."""
-        word = self.fetch_word(word)
-
-        from english_dictionary.utils.formatter import BaseAPIFormatter
-
-        formatter = BaseAPIFormatter(word)
+        self.database.save_word(word_data)
+        self.rendered_words.discard(name)
+        # Words are compared by name, so the details of the word replaced need not be loaded
+        self.word_list.replace_word(WordData(name), WordData.from_api(word_data))
+        self.refresh_matches()
 
-        return (
-            f"<b style='font-size: 40px'>{word.get_name().capitalize()}</b><hr />"
-            + formatter.to_html()
-        )
+        # Show the new details of the word
+        if (row := self.word_list.row(name)) is not None:
+            self.list_view.setCurrentIndex(self.word_list.index(row))
+        self.display_detail()
+        return True
 
-    def fill_with_dummy_data(self):
-        with Database(DATABASE_DIRECTORY / DATABASE_NAME) as db:
-            for word in db.fetch_all_words():
-                word_data = WordData.from_api(word)
-                self.dictionary.append(word_data)
-                self.update_dictionary([word_data.get_name()])
+    def parse_word_data(self, word: str) -> str:
+        """
+        Convert a word (with name alone) into HTML with all its details.
+        Pages are cached until the word changes, so words displayed again are not loaded nor rendered again.
+        """
+        revision = self.dictionary.revision(word)
+        html = self.rendered_words.get(word, revision)
+
+        if html is None:
+            html = render_word(self.fetch_word(word))
+            self.rendered_words.put(word, revision, html)
+
+        return html
+
+    def load_word(self, row_id: int) -> BaseAPI:
+        """Load the details of a word from the database"""
+        return self.database.fetch_word(row_id)
+
+    def load_words_in_background(self) -> None:
+        """
+        Fill the dictionary with the names of the stored words without blocking the UI.
+        Words can be searched as soon as they arrive, and their details are loaded when displayed.
+        """
+        self.word_loader = WordLoader(self.database, self)
+        self.word_loader.words_loaded.connect(self.add_loaded_words)
+        self.word_loader.progress.connect(self.show_loading_progress)
+        self.word_loader.finished.connect(self.finish_loading_words)
+        self.word_loader.start()
+
+        # Started once the words are loaded, not to compete with them for the database
+        self.row_converter = RowConverter(self.database, self)
+
+    def add_loaded_words(self, words: List[WordStub]) -> None:
+        self.word_list.add_words(words)
+
+        if not self.list_view.currentIndex().isValid():
+            self.list_view.setCurrentIndex(self.word_list.index(0))
+
+    def show_loading_progress(self, loaded: int, total: int) -> None:
+        self.statusBar().showMessage(f"Loading words... {loaded}/{total}")
+
+    def finish_loading_words(self) -> None:
+        self.statusBar().clearMessage()
+
+        # Matches were searched among the words loaded at the time
+        self.refresh_matches()
+
+        if not self.word_loader.isInterruptionRequested():
+            self.row_converter.start()
+
+    def closeEvent(self, event) -> None:
+        self.word_loader.requestInterruption()
+        self.word_loader.wait()
+        self.row_converter.requestInterruption()
+        self.row_converter.wait()
+        self.lookup_client.close(wait=False)
+        self.database.close()
+        super(MainWindow, self).closeEvent(event)
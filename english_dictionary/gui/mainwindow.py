@@ -57,14 +57,16 @@ class Ui_MainWindow(object):
         self.scrollAreaWidgetContents_2.setObjectName("scrollAreaWidgetContents_2")
         self.verticalLayout_3 = QtWidgets.QVBoxLayout(self.scrollAreaWidgetContents_2)
         self.verticalLayout_3.setObjectName("verticalLayout_3")
-        self.list_widget = QtWidgets.QListWidget(self.scrollAreaWidgetContents_2)
+        self.list_view = QtWidgets.QListView(self.scrollAreaWidgetContents_2)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         sizePolicy.setHorizontalStretch(0)
         sizePolicy.setVerticalStretch(0)
-        sizePolicy.setHeightForWidth(self.list_widget.sizePolicy().hasHeightForWidth())
-        self.list_widget.setSizePolicy(sizePolicy)
-        self.list_widget.setObjectName("list_widget")
-        self.verticalLayout_3.addWidget(self.list_widget)
+        sizePolicy.setHeightForWidth(self.list_view.sizePolicy().hasHeightForWidth())
+        self.list_view.setSizePolicy(sizePolicy)
+        self.list_view.setSpacing(1)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setObjectName("list_view")
+        self.verticalLayout_3.addWidget(self.list_view)
         self.scrollArea.setWidget(self.scrollAreaWidgetContents_2)
         self.verticalLayout.addWidget(self.scrollArea)
         self.verticalLayout.setStretch(0, 1)
@@ -101,7 +103,6 @@ class Ui_MainWindow(object):
         MainWindow.setCentralWidget(self.central_widget)
 
         self.retranslateUi(MainWindow)
-        self.list_widget.setCurrentRow(-1)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
 
     def retranslateUi(self, MainWindow):
@@ -110,6 +111,5 @@ class Ui_MainWindow(object):
         self.search_bar.setPlaceholderText(_translate("MainWindow", "Search"))
         self.search_button.setToolTip(_translate("MainWindow", "Search word from the internet"))
         self.add_button.setToolTip(_translate("MainWindow", "Manually add a new word"))
-        self.list_widget.setSortingEnabled(True)
         self.edit_button.setToolTip(_translate("MainWindow", "Edit currently displayed word"))
         self.delete_button.setToolTip(_translate("MainWindow", "Delete currently displayed word"))
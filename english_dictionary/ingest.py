@@ -0,0 +1,352 @@
+"""
+Seed the database from dumps of FreeDictionaryAPI data too big to be loaded in memory.
+
+The dump is read incrementally (JSON lines, or a JSON array read one element at a time),
+its entries are parsed, converted to the base API and encoded for the database in a pool
+of processes, and the words are saved in batches. Only a few chunks of entries are in flight at once, so memory
+does not grow with the size of the dump.
+"""
+
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .api import BaseAPI, BaseAPIBuilder
+from .codec import EntryCodec, encode_entry
+from .database import Database
+
+# Characters read from the dump at a time
+READ_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"\s*")
+# A decoding error this close to the end of what was read may only be due to an element cut short
+_TRUNCATION_MARGIN = 16
+# Characters of an element of a JSON array dump beyond which it is taken for malformed (e.g. never closed)
+MAX_ELEMENT_SIZE = 1 << 24
+# A "," followed by an object or an array: likely the start of the next element of a dump
+_NEXT_ELEMENT = re.compile(r",\s*(?=[\[{])")
+
+
+@dataclass
+class IngestReport:
+    entries: int = 0
+    invalid: int = 0
+    words: int = 0
+    seconds: float = 0.0
+    # Bytes, of this process or of its biggest worker (sampled as they convert the entries)
+    peak_rss: Optional[int] = None
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        report = (
+            f"{self.entries} entries ({self.invalid} invalid), {self.words} words saved, "
+            f"in {self.seconds:.1f}s ({self.entries_per_second:.0f} entries/s)"
+        )
+        if self.peak_rss is not None:
+            report += f", peak RSS {self.peak_rss / 2**20:.0f} MiB"
+
+        return report
+
+
+def peak_rss() -> Optional[int]:
+    """Return the peak resident memory (in bytes) of this process, if known"""
+    if resource is None:
+        return None
+
+    # ru_maxrss is in kilobytes, except on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return scale * resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _element_end(text: str, start: int) -> Optional[int]:
+    """
+    Return the end of the array element at :param start of :param text, which cannot be decoded:
+    the position of the next "," or "]" outside of its strings and brackets, or None if it is not in :param text
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for position in range(start, len(text)):
+        char = text[position]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif char in "]}" and depth > 0:
+            depth -= 1
+        elif char in ",]" and depth == 0:
+            return position
+
+    return None
+
+
+def _skip_to_next_element(
+    file: TextIO, buffer: str, position: int, read_size: int
+) -> Optional[Tuple[str, int]]:
+    """
+    Skip :param buffer from :param position, and :param file after it, up to the next "," followed by
+    an object or an array. Return the text left and the position of the "," in it,
+    or None if the file ends first (with the "]" ending the array).
+    """
+    while (match := _NEXT_ELEMENT.search(buffer, position)) is None:
+        chunk = file.read(read_size)
+        if not chunk:
+            if not buffer.rstrip().endswith("]"):
+                raise ValueError("Unexpected end of the JSON array")
+            return None
+
+        # Keep the last character (a "," maybe) and the whitespace after it, the rest did not match
+        buffer = buffer[max(len(buffer.rstrip()) - 1, position) :] + chunk
+        position = 0
+
+    return (buffer, match.start())
+
+
+def iter_json_array(
+    file: TextIO, read_size: int = READ_SIZE, max_element_size: int = MAX_ELEMENT_SIZE
+) -> Iterator[str]:
+    """
+    Yield the JSON text of the elements of the array in :param file one at a time,
+    reading :param read_size characters at a time. Raises ValueError if the file is not a JSON array.
+
+    Malformed elements are yielded as they are (up to the next "," or "]"), like malformed lines of JSON lines.
+    An element longer than :param max_element_size characters (e.g. with an unclosed bracket) is yielded
+    cut short, and the array is read again from the next "," followed by an object or an array:
+    from then on, the array is skipped to such a "," whenever it is not as expected.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    # Expected next: "[" to start, then an element or "]", then "," or "]" after every element
+    expected = "["
+    # Whether the array was skipped to an element which may not be one of its own
+    resynchronised = False
+
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+
+        if position == len(buffer):
+            chunk = file.read(read_size)
+            if not chunk:
+                raise ValueError("Unexpected end of the JSON array")
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        char = buffer[position]
+
+        if expected == "[":
+            if char != "[":
+                raise ValueError("The dump is not a JSON array")
+            position += 1
+            expected = "element or ]"
+        elif char == "]" and expected != "element" and not resynchronised:
+            return
+        elif expected == ",":
+            if char != "," and resynchronised:
+                # Maybe the end of an element skipped to, rather than of the array
+                skipped = _skip_to_next_element(file, buffer, position, read_size)
+                if skipped is None:
+                    return
+                buffer, position = skipped
+                continue
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in the JSON array, got {char!r}")
+            position += 1
+            expected = "element"
+        else:
+            try:
+                _, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                truncated = (
+                    error.msg.startswith("Unterminated string")
+                    or len(buffer) - error.pos <= _TRUNCATION_MARGIN
+                )
+                end = None if truncated else _element_end(buffer, position)
+
+                if end is None and len(buffer) - position > max_element_size:
+                    # Too long to be an element cut short: yielded cut short (so invalid) and skipped
+                    yield buffer[position : position + max_element_size]
+                    skipped = _skip_to_next_element(
+                        file, buffer, position + 1, read_size
+                    )
+                    if skipped is None:
+                        return
+                    buffer, position = skipped
+                    expected = ","
+                    resynchronised = True
+                    continue
+
+                if end is None:
+                    # The element is not complete yet: read at least as much again,
+                    # so that large elements are not parsed over and over
+                    chunk = file.read(max(read_size, len(buffer) - position))
+                    if not chunk:
+                        raise
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+
+            if end == len(buffer):
+                # A number may go on in the next chunk
+                chunk = file.read(read_size)
+                if chunk:
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+
+            yield buffer[position:end]
+            position = end
+            expected = ","
+
+
+def open_dump(path: Union[Path, str]) -> TextIO:
+    """Open a dump, which may be compressed with gzip (.gz)"""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+
+    return open(path, encoding="utf-8")
+
+
+def iter_dump(path: Union[Path, str]) -> Iterator[str]:
+    """
+    Yield the JSON text of the entries of the dump at :param path, without parsing them:
+    the lines of JSON lines files (.jsonl, .ndjson), or the elements of the array of other files
+    """
+    path = Path(path)
+    with open_dump(path) as file:
+        if {".jsonl", ".ndjson"} & set(path.suffixes):
+            yield from (line for line in file if line.strip())
+        else:
+            yield from iter_json_array(file)
+
+
+# The words of a chunk of entries, the words encoded, the number of entries and of invalid entries,
+# and the peak resident memory of the process which converted them
+Chunk = Tuple[List[BaseAPI], List[Union[str, bytes]], int, int, Optional[int]]
+
+
+def transform(records: List[str], codec: EntryCodec) -> Chunk:
+    """
+    Parse and convert a chunk of dump entries (FreeDictionaryAPI responses, or single words of responses)
+    to the base API, and encode them with :param codec.
+    The data groups of a response with the same name are merged into a single word.
+    """
+    words = []
+    invalid = 0
+
+    for record in records:
+        try:
+            entry = json.loads(record)
+            groups = entry if isinstance(entry, list) else [entry]
+            words.extend(
+                [data_group]
+                for data_group in BaseAPIBuilder.merge(
+                    [BaseAPIBuilder.from_free_dictionary_api(groups)]
+                )
+                if data_group["name"]
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            invalid += 1
+
+    encoded = [encode_entry(word_data[0], codec) for word_data in words]
+    return (words, encoded, len(records), invalid, peak_rss())
+
+
+def _transform_chunks(
+    chunks: Iterable[List[str]], codec: EntryCodec, workers: int
+) -> Iterator[Chunk]:
+    """
+    Transform :param chunks in order, in :param workers processes (in this one if 0),
+    with no more than two chunks per worker read ahead
+    """
+    if workers == 0:
+        yield from (transform(chunk, codec) for chunk in chunks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(transform, chunk, codec))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def ingest(
+    path: Union[Path, str],
+    database: Database,
+    workers: Optional[int] = None,
+    chunk_size: int = 500,
+    batch_size: int = 5000,
+    progress: Optional[Callable[[IngestReport], None]] = None,
+) -> IngestReport:
+    """
+    Save the words of the dump at :param path in :param database, replacing the words with the same name
+    (so the last entry of a word in the dump wins).
+
+    :param workers: Processes converting the entries, :param chunk_size entries at a time.
+        Defaults to the number of CPUs, 0 converts them in this process.
+    :param batch_size: Words saved per transaction. :param progress is called after every batch.
+    """
+    start = time.perf_counter()
+    report = IngestReport()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    records = iter_dump(path)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    batch: List[BaseAPI] = []
+    encoded: List[Union[str, bytes]] = []
+    workers_peak_rss = 0
+
+    def save_batch() -> None:
+        report.words += database.save_words(batch, encoded=encoded)
+        batch.clear()
+        encoded.clear()
+        report.seconds = time.perf_counter() - start
+        rss = peak_rss()
+        report.peak_rss = None if rss is None else max(rss, workers_peak_rss)
+        if progress is not None:
+            progress(report)
+
+    for words, words_encoded, entries, invalid, rss in _transform_chunks(
+        chunks, database.codec, workers
+    ):
+        batch.extend(words)
+        encoded.extend(words_encoded)
+        report.entries += entries
+        report.invalid += invalid
+        workers_peak_rss = max(workers_peak_rss, rss or 0)
+
+        if len(batch) >= batch_size:
+            save_batch()
+
+    save_batch()
+    return report
@@ -0,0 +1,111 @@
+"""
+Fetch the words of a word list (from FreeDictionaryAPI, or the providers of the client) and store them, many at a time.
+
+Words already in the database are skipped, and the words fetched are saved in batches
+as they arrive, so an interrupted prefetch resumes where it stopped when run again.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+from .api import BaseAPI, LookupClient, WordNotFound
+from .database import Database
+
+
+@dataclass
+class PrefetchReport:
+    requested: int = 0
+    skipped: int = 0
+    fetched: int = 0
+    not_found: int = 0
+    failed: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.fetched + self.not_found + len(self.failed)
+
+    @property
+    def words_per_second(self) -> float:
+        return self.done / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.fetched} fetched, {self.not_found} not found, {len(self.failed)} failed, "
+            f"{self.skipped} already stored, in {self.seconds:.1f}s ({self.words_per_second:.1f} words/s)"
+        )
+
+
+def read_word_list(path: Union[Path, str]) -> List[str]:
+    """Return the words of a file holding one word per line, without duplicates, blank lines or # comments"""
+    words = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            word = line.strip().lower()
+            if word and not word.startswith("#"):
+                words[word] = None
+
+    return list(words)
+
+
+def prefetch(
+    words: Iterable[str],
+    database: Database,
+    client: LookupClient,
+    batch_size: int = 100,
+    progress: Optional[Callable[[PrefetchReport], None]] = None,
+) -> PrefetchReport:
+    """
+    Fetch the :param words not stored in :param database yet with :param client (as many at a time as its workers),
+    and save them :param batch_size at a time, calling :param progress after every batch.
+    """
+    start = time.perf_counter()
+    report = PrefetchReport()
+    stored: Set[str] = {name.lower() for name in database.iter_names()}
+    pending: Dict[Future, str] = {}
+    batch: List[BaseAPI] = []
+    # Only a few lookups per worker are queued at once, so memory does not grow with the word list
+    max_pending = 4 * client.max_workers
+
+    def save_batch() -> None:
+        database.save_words(batch)
+        batch.clear()
+        report.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(report)
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            word = pending.pop(future)
+            try:
+                batch.append(future.result())
+                report.fetched += 1
+            except WordNotFound:
+                report.not_found += 1
+            except Exception:
+                report.failed.append(word)
+
+        if len(batch) >= batch_size:
+            save_batch()
+
+    for word in words:
+        report.requested += 1
+        word = word.lower()
+        if word in stored:
+            report.skipped += 1
+            continue
+
+        stored.add(word)
+        pending[client.lookup(word)] = word
+
+        if len(pending) >= max_pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+    while pending:
+        collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+    save_batch()
+    return report
@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
 from PyQt5.QtWidgets import QApplication
 
 import english_dictionary
+from english_dictionary.api import FreeDictionaryApi, LookupClient, create_provider
+from english_dictionary.cache import CACHE_NAME, ResponseCache
+from english_dictionary.database import DATABASE_DIRECTORY, DATABASE_NAME, Database
+from english_dictionary.ingest import ingest
+from english_dictionary.prefetch import prefetch, read_word_list
+from english_dictionary.throttle import DEFAULT_BURST, DEFAULT_RATE, TokenBucket
 
 
-def main():
+def run_gui() -> None:
     import sys
 
     app = QApplication(sys.argv)
@@ -13,5 +23,112 @@ def main():
     sys.exit(app.exec_())
 
 
+def run_prefetch(args: argparse.Namespace) -> None:
+    words = read_word_list(args.word_list)
+    database = Database(args.database)
+
+    def show_progress(report) -> None:
+        print(
+            f"{report.done + report.skipped}/{len(words)} words "
+            f"({report.words_per_second:.1f} words/s)",
+            flush=True,
+        )
+
+    cache = ResponseCache(args.database.parent / CACHE_NAME)
+
+    limiter = TokenBucket(args.rate, args.burst)
+
+    with LookupClient(
+        max_workers=args.concurrency,
+        base_url=args.base_url,
+        cache=cache,
+        limiter=limiter,
+        fallback=True,
+    ) as client:
+        if args.wiktionary_dump is not None:
+            # The local dump is looked up first, FreeDictionaryAPI only for the words it misses
+            client.providers.insert(
+                0, create_provider("wiktionary", path=args.wiktionary_dump)
+            )
+        report = prefetch(words, database, client, args.batch_size, show_progress)
+
+    print(report)
+    if report.failed:
+        print("Failed (run again to retry):", ", ".join(report.failed))
+
+
+def run_ingest(args: argparse.Namespace) -> None:
+    database = Database(args.database)
+
+    report = ingest(
+        args.dump,
+        database,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        progress=lambda report: print(report, flush=True),
+    )
+    print(report)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="eng-dict", description="An (offline) English Dictionary"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    prefetch_parser = commands.add_parser(
+        "prefetch",
+        help="fetch the words of a word list (one per line) and store them",
+    )
+    prefetch_parser.add_argument("word_list", type=Path)
+    prefetch_parser.add_argument(
+        "--concurrency", type=int, default=16, help="number of parallel requests"
+    )
+    prefetch_parser.add_argument(
+        "--batch-size", type=int, default=100, help="words saved per transaction"
+    )
+    prefetch_parser.add_argument(
+        "--database", type=Path, default=DATABASE_DIRECTORY / DATABASE_NAME
+    )
+    prefetch_parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE, help="requests per second"
+    )
+    prefetch_parser.add_argument(
+        "--burst", type=int, default=DEFAULT_BURST, help="requests sent at once"
+    )
+    prefetch_parser.add_argument("--base-url", default=FreeDictionaryApi.BASE_URL)
+    prefetch_parser.add_argument(
+        "--wiktionary-dump",
+        type=Path,
+        help="also look the words up in a Wiktionary dump (wiktextract JSON lines)",
+    )
+
+    ingest_parser = commands.add_parser(
+        "ingest",
+        help="store the words of a FreeDictionaryAPI dump (JSON array or JSON lines, optionally gzipped)",
+    )
+    ingest_parser.add_argument("dump", type=Path)
+    ingest_parser.add_argument(
+        "--workers",
+        type=int,
+        help="processes converting the entries (default: one per CPU, 0 for none)",
+    )
+    ingest_parser.add_argument(
+        "--batch-size", type=int, default=5000, help="words saved per transaction"
+    )
+    ingest_parser.add_argument(
+        "--database", type=Path, default=DATABASE_DIRECTORY / DATABASE_NAME
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "prefetch":
+        run_prefetch(args)
+    elif args.command == "ingest":
+        run_ingest(args)
+    else:
+        run_gui()
+
+
 if __name__ == "__main__":
     main()
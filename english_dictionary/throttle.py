@@ -0,0 +1,113 @@
+"""
+Rate limiting and retries of the requests sent to the dictionary API.
+
+Every lookup of a host goes through the same token bucket, so the app, the lookup workers and
+the prefetcher together stay under the request rate of the API. Throttled (429) and failed (5xx)
+requests are retried after an exponential backoff with jitter, or after the delay the API asks for
+in its Retry-After header, unless that is longer than the maximum backoff.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Conservative defaults for the public FreeDictionaryAPI
+DEFAULT_RATE = 3.0
+DEFAULT_BURST = 10
+
+
+class TokenBucket:
+    """
+    Allows :param rate requests per second on average, and bursts of up to :param burst requests.
+    Can be shared by several threads: each acquire reserves a token, so waiting threads are served in turn.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Wait until a request may be sent, returning the time waited in seconds"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            # The token is taken right away, the balance going negative while it is waited for
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        if wait:
+            self._sleep(wait)
+
+        return wait
+
+
+_shared_limiters: Dict[str, TokenBucket] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_limiter(url: str) -> TokenBucket:
+    """Return the token bucket shared by all the requests to the host of :param url"""
+    host = urlsplit(url).netloc
+
+    with _shared_limiters_lock:
+        if host not in _shared_limiters:
+            _shared_limiters[host] = TokenBucket()
+
+        return _shared_limiters[host]
+
+
+@dataclass
+class RetryPolicy:
+    retries: int = 5
+    # Seconds before the first retry, doubled for every following one
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Return the seconds to wait before retrying after the failed :param attempt (0 for the first request):
+        the Retry-After delay if given, or a random delay up to the exponential backoff ("full jitter")
+        so that clients throttled together do not retry together.
+        Returns None (do not retry) if the Retry-After delay is longer than max_backoff.
+        """
+        if retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_backoff else None
+
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Return the seconds to wait given a Retry-After header (seconds or HTTP date), if valid"""
+    value = value.strip()
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
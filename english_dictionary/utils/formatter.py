@@ -1,4 +1,7 @@
+from typing import Optional
+
 from english_dictionary.core import WordData
+from english_dictionary.utils.helpers import LRUCache
 
 
 class BaseAPIFormatter:
@@ -36,3 +39,45 @@ class BaseAPIFormatter:
             "<pre style='font-family: inherit;'>" + section + "</pre>"
             for section in html_version
         )
+
+
+def render_word(word: WordData) -> str:
+    """Return the HTML page displaying :param word with all its details"""
+    return (
+        f"<b style='font-size: 40px'>{word.get_name().capitalize()}</b><hr />"
+        + BaseAPIFormatter(word).to_html()
+    )
+
+
+class RenderCache:
+    """
+    Rendered HTML pages of the (:param maxsize most recently displayed) words.
+
+    Pages are stored along with the revision of the word they were rendered from
+    (see Dictionary.revision), so the page of a word changed since is never returned.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self._pages = LRUCache(maxsize=maxsize)
+
+    def get(self, word: str, revision: int) -> Optional[str]:
+        cached = self._pages.get(word)
+        if cached is None or cached[0] != revision:
+            return None
+
+        return cached[1]
+
+    def put(self, word: str, revision: int, html: str) -> None:
+        self._pages.put(word, (revision, html))
+
+    def discard(self, word: str) -> None:
+        self._pages.discard(word)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
@@ -1,4 +1,6 @@
-from typing import Iterable, Sequence, Union
+from collections import OrderedDict
+from dataclasses import fields
+from typing import Any, Hashable, Iterable, Optional, Sequence, Type, Union
 
 
 def binary_search(array: Sequence[Union[str, int]], target: Union[str, int]):
@@ -23,6 +25,47 @@ def binary_search(array: Sequence[Union[str, int]], target: Union[str, int]):
     return -1
 
 
+def edit_distance(first: str, second: str, max_distance: Optional[int] = None) -> int:
+    """
+    Return the edit distance between two strings, counting insertions, deletions, substitutions
+    and transpositions of adjacent characters (optimal string alignment distance).
+
+    If :param max_distance is given, the computation stops early and returns max_distance + 1
+    as soon as the distance is known to exceed it.
+    """
+    if max_distance is not None and abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    before_previous_row = None
+    previous_row = list(range(len(second) + 1))
+
+    for i in range(1, len(first) + 1):
+        row = [i] + [0] * len(second)
+
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            row[j] = min(
+                previous_row[j] + 1,
+                row[j - 1] + 1,
+                previous_row[j - 1] + cost,
+            )
+
+            if (
+                i > 1
+                and j > 1
+                and first[i - 1] == second[j - 2]
+                and first[i - 2] == second[j - 1]
+            ):
+                row[j] = min(row[j], before_previous_row[j - 2] + 1)
+
+        if max_distance is not None and min(row) > max_distance:
+            return max_distance + 1
+
+        before_previous_row, previous_row = previous_row, row
+
+    return previous_row[-1]
+
+
 def convert_to_list(iterable: Iterable[str], start=1):
     """
     Returns numbered strings starting from :start
@@ -42,3 +85,62 @@ def convert_to_list(iterable: Iterable[str], start=1):
             enumerate(iterable, start=start),
         )
     )
+
+
+class LRUCache:
+    """
+    Mapping holding at most :param maxsize items.
+    When full, adding an item evicts the least recently used one.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._items = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value of :param key (marking it as recently used), or :param default if absent"""
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            return default
+
+        return self._items[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove :param key from the cache, if present"""
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def add_slots(cls: Type[Any]) -> Type[Any]:
+    """
+    Class decorator recreating a dataclass with __slots__ for its fields, so its instances
+    have no per-instance __dict__ (``@dataclass(slots=True)`` requires python 3.10).
+    Must be applied on top of @dataclass.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace["__slots__"] = field_names
+
+    # Field defaults are part of the generated __init__, so the class attributes can go
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
@@ -1,6 +1,6 @@
 import pytest
 
-from english_dictionary.utils.helpers import binary_search
+from english_dictionary.utils.helpers import LRUCache, binary_search, edit_distance
 
 
 @pytest.mark.parametrize(
@@ -18,3 +18,36 @@ from english_dictionary.utils.helpers import binary_search
 def test_binary_search(test_input, result):
     sequence, target = test_input
     assert binary_search(sequence, target) == result
+
+
+@pytest.mark.parametrize(
+    "test_input, result",
+    [
+        (("kitten", "sitting", None), 3),
+        (("kitten", "sitting", 1), 2),
+        (("monarch", "monarch", None), 0),
+        (("monarhc", "monarch", None), 1),
+        (("", "abc", None), 3),
+        (("king", "", 2), 3),
+    ],
+)
+def test_edit_distance(test_input, result):
+    first, second, max_distance = test_input
+    assert edit_distance(first, second, max_distance) == result
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+    assert len(cache) == 2
+
+    cache.discard("a")
+    assert "a" not in cache
+    cache.clear()
+    assert len(cache) == 0
@@ -1,6 +1,21 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+import requests
 
-from english_dictionary.api import FreeDictionaryApi, BaseAPIBuilder
+from english_dictionary.api import (
+    FreeDictionaryApi,
+    BaseAPIBuilder,
+    LookupClient,
+    WiktionaryDumpProvider,
+    WordNotFound,
+    create_provider,
+)
+from english_dictionary.cache import ResponseCache
+from english_dictionary.throttle import RetryPolicy, TokenBucket, parse_retry_after
 
 
 @pytest.fixture
@@ -183,6 +198,102 @@ def free_dictionary_api_instance_with_word_hello(mocker, hello):
     return instance
 
 
+class StubDictionaryHandler(BaseHTTPRequestHandler):
+    """
+    Serves the words of the server like FreeDictionaryAPI (with ETags), after its delay.
+    The first server.throttled requests are rejected with 429 Too Many Requests.
+    """
+
+    def do_GET(self) -> None:
+        word = self.path.rsplit("/", 1)[-1]
+        self.server.requests.append(word)
+        time.sleep(self.server.delay)
+
+        if self.server.throttled:
+            self.server.throttled -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", self.server.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if word in self.server.words:
+            body = json.dumps(self.server.words[word]).encode()
+            etag = f'"{hash(body)}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("ETag", etag)
+        else:
+            body = b'{"title": "No Definitions Found"}'
+            self.send_response(404)
+
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def dictionary_server(king, hello):
+    """Local stand-in for FreeDictionaryAPI, its base url is dictionary_server.url"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDictionaryHandler)
+    server.words = {"king": king, "hello": hello}
+    server.requests = []
+    server.delay = 0
+    server.throttled = 0
+    server.retry_after = "0"
+    server.url = f"http://127.0.0.1:{server.server_port}/api/v2/entries/en/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def wiktionary_dump(tmp_path):
+    """A Wiktionary dump in the format of wiktextract, with a word in another language"""
+    entries = [
+        {
+            "word": "king",
+            "lang_code": "en",
+            "pos": "noun",
+            "etymology_text": "From Old English cyning.",
+            "sounds": [{"ipa": "/kɪŋ/"}, {"audio": "king.ogg"}],
+            "senses": [
+                {
+                    "glosses": ["A male monarch."],
+                    "examples": [{"text": "The king was crowned."}],
+                    "synonyms": [{"word": "monarch"}],
+                },
+                {"tags": ["no-gloss"]},
+            ],
+        },
+        {"word": "koning", "lang_code": "nl", "pos": "noun", "senses": []},
+        {
+            "word": "king",
+            "lang_code": "en",
+            "pos": "verb",
+            "senses": [{"glosses": ["To make king.", "To crown."]}],
+        },
+    ]
+    path = tmp_path / "wiktionary.jsonl"
+    path.write_text(
+        "".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8"
+    )
+    return path
+
+
 class TestFreeDictionaryAPI:
     def test_base_url(self):
         assert (
@@ -212,3 +323,344 @@ class TestBaseAPIBuilder:
             assert section.get("etymology") == king[i].get("origin")
             assert section.get("pronunciations") == king[i].get("phonetics")
             # assert section.get("meanings") == king[i].get("meanings")
+
+    def test_from_wiktionary(self, wiktionary_dump):
+        entries = [json.loads(line) for line in wiktionary_dump.open(encoding="utf-8")]
+        king, koning = BaseAPIBuilder.from_wiktionary(entries)
+
+        assert koning["name"] == "koning"
+        assert king["etymology"] == "From Old English cyning."
+        assert king["pronunciations"] == [{"text": "/kɪŋ/", "audio": ""}]
+        assert king["meanings"] == [
+            {
+                "part_of_speech": "noun",
+                "definitions": [
+                    {
+                        "definition": "A male monarch.",
+                        "example": "The king was crowned.",
+                        "related_words": [
+                            {"relationship_type": "synonyms", "words": ["monarch"]},
+                            {"relationship_type": "antonyms", "words": []},
+                        ],
+                    }
+                ],
+            },
+            {
+                "part_of_speech": "verb",
+                "definitions": [
+                    {
+                        "definition": "To make king.; To crown.",
+                        "example": None,
+                        "related_words": [
+                            {"relationship_type": "synonyms", "words": []},
+                            {"relationship_type": "antonyms", "words": []},
+                        ],
+                    }
+                ],
+            },
+        ]
+
+    def test_merge(self, king, wiktionary_dump):
+        free_dictionary = BaseAPIBuilder.from_free_dictionary_api(king)
+        wiktionary = WiktionaryDumpProvider(wiktionary_dump).lookup("king")
+        merged, god_save_the_queen = BaseAPIBuilder.merge([free_dictionary, wiktionary])
+
+        assert god_save_the_queen == free_dictionary[1]
+        assert merged["etymology"] == free_dictionary[0]["etymology"]
+        noun, verb = merged["meanings"]
+        assert noun["definitions"] == (
+            free_dictionary[0]["meanings"][0]["definitions"]
+            + wiktionary[0]["meanings"][0]["definitions"]
+        )
+        assert len(verb["definitions"]) == 3
+        assert merged["pronunciations"] == free_dictionary[0]["pronunciations"]
+        # The data merged is not modified
+        assert len(free_dictionary[0]["meanings"][0]["definitions"]) == 2
+
+
+class TestProviders:
+    def test_wiktionary_dump(self, wiktionary_dump):
+        provider = create_provider("wiktionary", path=wiktionary_dump)
+
+        (king,) = provider.lookup(" KING ")
+        assert [meaning["part_of_speech"] for meaning in king["meanings"]] == [
+            "noun",
+            "verb",
+        ]
+
+        for word in ("koning", "queen"):
+            with pytest.raises(WordNotFound):
+                provider.lookup(word)
+
+        with pytest.raises(ValueError):
+            create_provider("unknown")
+
+
+class SlowProvider:
+    """Looks words up in a dictionary (of base API data) after a delay, or fails with an error"""
+
+    name = "slow"
+
+    def __init__(self, words=(), delay=0.0, error=None) -> None:
+        self.words = dict(words)
+        self.delay = delay
+        self.error = error
+        self.lookups = []
+
+    def lookup(self, word):
+        self.lookups.append(word)
+        time.sleep(self.delay)
+
+        if self.error is not None:
+            raise self.error
+        if word not in self.words:
+            raise WordNotFound(word)
+
+        return self.words[word]
+
+
+class TestFanOut:
+    def test_first_result_wins(self, king):
+        king = BaseAPIBuilder.from_free_dictionary_api(king)
+        slow = SlowProvider({"king": king[:1]}, delay=0.5)
+        fast = SlowProvider({"king": king}, delay=0.05)
+
+        with LookupClient(max_workers=2, providers=[slow, fast]) as client:
+            start = time.perf_counter()
+            assert client.lookup("king").result(timeout=5) == king
+            assert time.perf_counter() - start < 0.3
+
+            client.close(wait=False)
+
+    def test_slower_lookups_are_cancelled(self, king):
+        king = BaseAPIBuilder.from_free_dictionary_api(king)
+        fast = SlowProvider({"king": king})
+        slow = SlowProvider({"king": king[:1]}, delay=1)
+
+        # The lookup of slow is still queued when fast finds the word
+        with LookupClient(max_workers=1, providers=[fast, slow]) as client:
+            assert client.lookup("king").result(timeout=5) == king
+
+        assert fast.lookups == ["king"]
+        assert slow.lookups == []
+
+    def test_missing_and_failed_lookups(self, king):
+        king = BaseAPIBuilder.from_free_dictionary_api(king)
+        failing = SlowProvider(error=requests.ConnectionError())
+
+        with LookupClient(providers=[SlowProvider(), SlowProvider()]) as client:
+            assert isinstance(client.lookup("king").exception(timeout=5), WordNotFound)
+
+        # A provider which fails might have had the word
+        with LookupClient(providers=[SlowProvider(), failing]) as client:
+            error = client.lookup("king").exception(timeout=5)
+            assert isinstance(error, requests.ConnectionError)
+
+        with LookupClient(providers=[failing, SlowProvider({"king": king})]) as client:
+            assert client.lookup("king").result(timeout=5) == king
+
+    def test_merge(self, king, wiktionary_dump):
+        free_dictionary = SlowProvider(
+            {"king": BaseAPIBuilder.from_free_dictionary_api(king)}, delay=0.1
+        )
+        wiktionary = WiktionaryDumpProvider(wiktionary_dump)
+
+        with LookupClient(
+            providers=[free_dictionary, wiktionary], merge=True
+        ) as client:
+            merged, _ = client.lookup("king").result(timeout=5)
+
+        assert len(merged["meanings"][0]["definitions"]) == 3
+
+    def test_fallback(self, king):
+        king = BaseAPIBuilder.from_free_dictionary_api(king)
+        local = SlowProvider({"king": king})
+        remote = SlowProvider({"king": king[:1], "queen": king[:1]})
+        failing = SlowProvider(error=requests.ConnectionError())
+
+        with LookupClient(providers=[local, remote], fallback=True) as client:
+            assert client.lookup("king").result(timeout=5) == king
+            assert client.lookup("queen").result(timeout=5) == king[:1]
+            assert isinstance(client.lookup("jack").exception(timeout=5), WordNotFound)
+
+        # The next provider is only queried for the words the previous one misses
+        assert local.lookups == ["king", "queen", "jack"]
+        assert remote.lookups == ["queen", "jack"]
+
+        with LookupClient(providers=[failing, remote], fallback=True) as client:
+            assert client.lookup("queen").result(timeout=5) == king[:1]
+            error = client.lookup("jack").exception(timeout=5)
+            assert isinstance(error, requests.ConnectionError)
+
+        with pytest.raises(ValueError):
+            LookupClient(providers=[local, remote], merge=True, fallback=True)
+
+
+class TestLookupClient:
+    def test_lookup(self, dictionary_server, king):
+        done = threading.Event()
+
+        with LookupClient(base_url=dictionary_server.url) as client:
+            future = client.lookup("King", callback=lambda future: done.set())
+            assert future.result(timeout=5) == BaseAPIBuilder.from_free_dictionary_api(
+                king
+            )
+            assert done.wait(timeout=5)
+
+            missing = client.lookup("missing")
+            assert isinstance(missing.exception(timeout=5), WordNotFound)
+
+        assert dictionary_server.requests == ["king", "missing"]
+
+    def test_timeout(self, dictionary_server):
+        dictionary_server.delay = 0.5
+
+        with LookupClient(timeout=(1, 0.1), base_url=dictionary_server.url) as client:
+            error = client.lookup("king").exception(timeout=5)
+
+        assert isinstance(error, requests.Timeout)
+
+    def test_cancel(self, dictionary_server, king):
+        dictionary_server.delay = 0.2
+
+        with LookupClient(max_workers=1, base_url=dictionary_server.url) as client:
+            running = client.lookup("king")
+            queued = client.lookup("hello")
+
+            while not (running.running() or running.done()):
+                time.sleep(0.01)
+
+            client.cancel_all()
+            assert queued.cancelled()
+            assert running.result(timeout=5)[0]["name"] == "king"
+
+        assert dictionary_server.requests == ["king"]
+
+
+class TestResponseCache:
+    def test_cached_lookups(self, dictionary_server, king):
+        api = FreeDictionaryApi(base_url=dictionary_server.url, cache=ResponseCache())
+
+        assert api.get_json(" King ") == king
+        assert api.get_json("king") == king
+
+        # Words not found are cached too
+        for _ in range(2):
+            with pytest.raises(requests.HTTPError):
+                api.get_json("missing")
+
+        assert dictionary_server.requests == ["king", "missing"]
+
+    def test_expired_responses_are_revalidated(self, dictionary_server, king):
+        cache = ResponseCache(ttl=0, negative_ttl=0)
+        api = FreeDictionaryApi(base_url=dictionary_server.url, cache=cache)
+
+        assert api.get_json("king") == king
+        fetched_at = cache.get("king").fetched_at
+        # Not modified (304): the cached response is used and refreshed
+        assert api.get_json("king") == king
+        assert cache.get("king").fetched_at > fetched_at
+
+        dictionary_server.words["king"] = king[:1]
+        assert api.get_json("king") == king[:1]
+        assert dictionary_server.requests == ["king"] * 3
+
+    def test_eviction_and_persistence(self, tmp_path, dictionary_server):
+        path = tmp_path / "cache.db"
+        cache = ResponseCache(path, max_entries=2)
+        api = FreeDictionaryApi(base_url=dictionary_server.url, cache=cache)
+
+        api.get_json("king")
+        api.get_json("hello")
+        api.get_json("king")
+        with pytest.raises(requests.HTTPError):
+            api.get_json("missing")
+
+        # hello was the least recently used
+        assert len(cache) == 2
+        assert cache.get("hello") is None
+        cache.close()
+
+        cache = ResponseCache(path, max_entries=2)
+        assert len(cache) == 2
+        assert cache.get("king").status_code == 200
+        assert cache.get("missing").status_code == 404
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestThrottling:
+    def test_token_bucket(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+
+        # The burst is sent right away, then the requests are spaced by 1 / rate
+        assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert clock.now == pytest.approx(1)
+
+        clock.now += 10
+        assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+
+    def test_retry_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=4)
+
+        assert policy.delay(0, "3") == 3
+        # Longer than the maximum backoff: not retried
+        assert policy.delay(0, "7") is None
+        assert all(0 <= policy.delay(attempt) <= 4 for attempt in range(10))
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("soon") is None
+
+    def test_throttled_requests_are_retried(self, dictionary_server, king):
+        dictionary_server.throttled = 2
+        api = FreeDictionaryApi(base_url=dictionary_server.url)
+
+        assert api.get_json("king") == king
+        assert dictionary_server.requests == ["king"] * 3
+
+    def test_retries_are_limited(self, dictionary_server):
+        dictionary_server.throttled = 10
+        api = FreeDictionaryApi(
+            base_url=dictionary_server.url, retry=RetryPolicy(retries=2)
+        )
+
+        with pytest.raises(requests.HTTPError) as error:
+            api.get_json("king")
+
+        assert error.value.response.status_code == 429
+        assert dictionary_server.requests == ["king"] * 3
+
+    def test_long_retry_after_is_not_waited_for(self, dictionary_server):
+        dictionary_server.throttled = 1
+        dictionary_server.retry_after = "3600"
+        api = FreeDictionaryApi(base_url=dictionary_server.url)
+
+        with pytest.raises(requests.HTTPError) as error:
+            api.get_json("king")
+
+        assert error.value.response.status_code == 429
+        assert dictionary_server.requests == ["king"]
+
+    def test_lookups_share_the_rate_limit(self, dictionary_server):
+        clock = FakeClock()
+        limiter = TokenBucket(rate=10, burst=1, clock=clock, sleep=clock.sleep)
+
+        with LookupClient(
+            max_workers=4, base_url=dictionary_server.url, limiter=limiter
+        ) as client:
+            futures = [client.lookup("king") for _ in range(5)]
+            for future in futures:
+                future.result(timeout=5)
+
+        assert clock.now == pytest.approx(0.4)
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+import pytest
+
+from english_dictionary.api import BaseAPIBuilder
+from english_dictionary.codec import BinaryCodec, JsonCodec, decode_entry
+from .test_api import king
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [JsonCodec(), BinaryCodec(), BinaryCodec(compression_level=9)],
+)
+def test_round_trip(codec, king):
+    for entry in BaseAPIBuilder.from_free_dictionary_api(king):
+        assert codec.is_encoded(codec.encode(entry))
+        assert decode_entry(codec.encode(entry)) == entry
+
+
+def test_binary_codec_values():
+    entry = {
+        "name": "ünïcode nul\0",
+        "values": [None, True, False, 0, 7, -1, 2**40, 1.5, "", {"": []}],
+        "repeated": ["noun", "noun", "noun"],
+    }
+    encoded = BinaryCodec().encode(entry)
+
+    assert encoded.count("repeated".encode()) == 1
+    assert BinaryCodec.decode(encoded) == entry
+
+    entries = [entry, {**entry, "name": "other"}]
+    assert BinaryCodec.decode(BinaryCodec().encode({"entries": entries})) == {
+        "entries": entries
+    }
+
+
+def test_binary_codec_errors():
+    unmarshallable = {"name": "king", "meanings": OrderedDict()}
+    with pytest.raises(ValueError):
+        BinaryCodec().encode(unmarshallable)
+
+    with pytest.raises(ValueError):
+        BinaryCodec(compression_level=10)
+
+    encoded = BinaryCodec.encode_json(unmarshallable)
+    assert BinaryCodec.is_encoded(encoded)
+    assert decode_entry(encoded) == unmarshallable
+
+    encoded = bytearray(BinaryCodec().encode({"name": "king"}))
+    encoded[2] = BinaryCodec.VERSION + 1
+    with pytest.raises(ValueError):
+        BinaryCodec.decode(bytes(encoded))
@@ -1,10 +1,21 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import pytest
 
 from english_dictionary.api import BaseAPIBuilder
-from english_dictionary.database import DATABASE_DIRECTORY, DATABASE_NAME, Database
-from .test_api import hello
+from english_dictionary.codec import BinaryCodec, JsonCodec
+from english_dictionary.database import (
+    DATABASE_DIRECTORY,
+    DATABASE_NAME,
+    MIGRATIONS,
+    ConnectionPool,
+    Database,
+)
+from .test_api import hello, king
 
 
 @pytest.fixture
@@ -28,3 +39,323 @@ def test_database(hello):
     a.delete_word("hello")
     for row in a.fetch_all_words():
         assert row is None
+
+
+def test_search_text(hello, king):
+    database = Database(":memory:")
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(hello))
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(king))
+
+    assert database.search_text("male ruler") == ["king"]
+    assert database.search_text("greet") == ["hello"]
+    assert database.search_text("Germanic") == ["king"]
+    assert database.search_text("hello") == ["hello"]
+    assert database.search_text("   ") == []
+
+    edited = BaseAPIBuilder.from_free_dictionary_api(king)
+    edited[0]["etymology"] = "Of Saxon origin"
+    database.edit_word(edited)
+    assert database.search_text("Germanic") == []
+    assert database.search_text("saxon") == ["king"]
+
+    database.delete_word("king")
+    assert database.search_text("ruler") == []
+
+
+def test_migrate_legacy_database(tmp_path, hello):
+    url = tmp_path / "words.db"
+    edited_hello = BaseAPIBuilder.from_free_dictionary_api(hello)
+    edited_hello[0]["etymology"] = "Variant of earlier hollo"
+    hello = BaseAPIBuilder.from_free_dictionary_api(hello)
+
+    with sqlite3.connect(url) as conn:
+        conn.execute(
+            "CREATE TABLE words (id INTEGER PRIMARY KEY, name TEXT, data JSON)"
+        )
+        conn.executemany(
+            "INSERT INTO words (name, data) VALUES (?, ?)",
+            [("hello", json.dumps(hello[0])), ("hello", json.dumps(edited_hello[0]))],
+        )
+    conn.close()
+
+    database = Database(url)
+    connection = database.get_connection()
+
+    assert connection.execute("PRAGMA user_version").fetchone() == (len(MIGRATIONS),)
+    assert list(database.fetch_all_words()) == [edited_hello]
+    assert database.search_text("hollo") == ["hello"]
+    # The words saved before are numbered as changes
+    assert [change for (change, *_) in database.iter_changed_since()] == [1]
+
+    database.save_word(hello)
+    assert list(database.fetch_all_words()) == [hello]
+    assert database.search_text("hollo") == []
+    assert [change for (change, *_) in database.iter_changed_since()] == [2]
+
+
+def test_new_database_file(tmp_path, hello):
+    # The schema is created when the database is opened
+    database = Database(tmp_path / "new.db")
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(hello))
+
+    connection = database.get_connection()
+    assert connection.execute("PRAGMA user_version").fetchone() == (len(MIGRATIONS),)
+    assert list(database.iter_names()) == ["hello"]
+    assert database.search_text("greet") == ["hello"]
+    assert [name for (_, _, name, _) in database.iter_changed_since()] == ["hello"]
+    database.close()
+
+
+def test_fetch_word_by_row_id(hello):
+    database = Database(":memory:")
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(hello))
+
+    [(row_id, name)] = database.fetch_word_names()
+    assert name == "hello"
+    assert database.fetch_word(row_id) == BaseAPIBuilder.from_free_dictionary_api(hello)
+    assert database.fetch_word(row_id + 1) is None
+
+    database.save_word([{"name": "abc", "meanings": []}])
+    assert [name for _, name in database.fetch_word_names()] == ["abc", "hello"]
+    assert database.count_words() == 2
+
+
+def test_import_export_jsonl(tmp_path, hello, king):
+    words = [
+        BaseAPIBuilder.from_free_dictionary_api(hello),
+        BaseAPIBuilder.from_free_dictionary_api(king),
+    ]
+    database = Database(":memory:")
+    assert database.save_words(words, batch_size=1) == 2
+    assert database.save_words([]) == 0
+
+    # The last of the words with the same name is kept
+    renamed = [{**words[0][0], "etymology": "renamed"}]
+    assert database.save_words([words[0], renamed]) == 1
+    assert database.search_text("greeting") == ["hello"]
+    assert database.fetch_word(1)[0]["etymology"] == "renamed"
+    database.save_word(words[0])
+
+    path = tmp_path / "words.jsonl"
+    assert database.export_jsonl(path) == 2
+    assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == [
+        "hello",
+        "king",
+    ]
+
+    imported = Database(":memory:")
+    assert imported.import_jsonl(path) == 2
+    assert list(imported.fetch_all_words()) == [word_data[:1] for word_data in words]
+    assert imported.search_text("ruler") == ["king"]
+
+
+def test_connection_pool(tmp_path, hello):
+    url = tmp_path / "words.db"
+    database = Database(url)
+
+    assert Database(url).get_connection() is database.get_connection()
+    assert ConnectionPool.shared(url) is ConnectionPool.shared(str(url))
+    assert database.get_connection().execute("PRAGMA journal_mode").fetchone() == (
+        "wal",
+    )
+
+    with Database(url) as db:
+        db.save_word(BaseAPIBuilder.from_free_dictionary_api(hello))
+
+    connections = []
+    thread = threading.Thread(
+        target=lambda: connections.append(database.get_connection())
+    )
+    thread.start()
+    thread.join()
+
+    assert connections[0] is not database.get_connection()
+    assert [name for _, name in database.fetch_word_names()] == ["hello"]
+
+    # The connection of the ended thread is closed once another thread connects
+    pool = ConnectionPool.shared(url)
+    assert len(pool) == 2
+    thread = threading.Thread(target=database.get_connection)
+    thread.start()
+    thread.join()
+    assert len(pool) == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+    # Connections of other threads can be closed, and are opened again when used
+    database.close()
+    assert len(pool) == 0
+    assert database.count_words() == 1
+
+
+def test_codecs_and_conversion(tmp_path, hello, king):
+    url = tmp_path / "words.db"
+    hello = BaseAPIBuilder.from_free_dictionary_api(hello)
+    king = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+
+    def storage_classes(database):
+        return {
+            storage_class
+            for (storage_class,) in database.get_connection().execute(
+                "SELECT typeof(data) FROM words"
+            )
+        }
+
+    json_database = Database(url, codec=JsonCodec())
+    json_database.save_words([hello, king])
+    assert storage_classes(json_database) == {"text"}
+
+    binary_database = Database(url, codec=BinaryCodec(compression_level=6))
+    assert list(binary_database.fetch_all_words()) == [hello, king]
+    assert binary_database.convert_rows(batch_size=1) == 2
+    assert binary_database.convert_rows() == 0
+    assert storage_classes(binary_database) == {"blob"}
+    assert list(json_database.fetch_all_words()) == [hello, king]
+
+    # Entries the binary codec cannot represent are kept as JSON, but not converted again
+    ordered = [{"name": "ordered", "meanings": OrderedDict()}]
+    binary_database.save_word(ordered)
+    assert binary_database.convert_rows() == 0
+    assert storage_classes(binary_database) == {"blob"}
+    assert [*binary_database.fetch_all_words()][-1] == ordered
+
+    # Stopped before any batch when interrupted
+    json_database.save_word([{"name": "queen", "meanings": []}])
+    assert binary_database.convert_rows(interrupted=lambda: True) == 0
+    assert storage_classes(binary_database) == {"text", "blob"}
+    assert binary_database.convert_rows(interrupted=lambda: False) == 1
+
+
+def without_missing_related_words(word_data):
+    for meaning in word_data[0]["meanings"]:
+        for definition in meaning["definitions"]:
+            for group in definition["related_words"]:
+                group["words"] = group["words"] or []
+    return word_data
+
+
+def test_normalised_schema(hello, king):
+    database = Database(":memory:")
+    hello_data = without_missing_related_words(
+        BaseAPIBuilder.from_free_dictionary_api(hello)
+    )
+    database.save_word(hello_data)
+
+    assert database.normalise() == 1
+    assert database.fetch_word_normalised("hello") == hello_data
+    assert database.fetch_word_normalised("missing") is None
+
+    # Kept up to date once normalised
+    king_data = without_missing_related_words(
+        BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    )
+    database.save_word(king_data)
+    assert database.fetch_word_normalised("king") == king_data
+    assert database.find_words_by_part_of_speech("noun") == ["hello", "king"]
+    assert database.find_words_by_part_of_speech("exclamation") == ["hello"]
+
+    king_data[0]["meanings"][0]["definitions"][0]["related_words"] = [
+        {"relationship_type": "synonyms", "words": ["monarch"]}
+    ]
+    database.edit_word(king_data)
+    assert database.fetch_word_normalised("king") == king_data
+    assert database.find_words_with_related_word("monarch") == ["king"]
+    assert database.find_words_with_related_word("monarch", "antonyms") == []
+
+    database.delete_word("king")
+    assert database.fetch_word_normalised("king") is None
+    # Editing a word which is no longer saved changes nothing, as in the words table
+    database.edit_word(king_data)
+    assert database.fetch_word_normalised("king") is None
+    assert database.find_words_with_related_word("monarch") == []
+    conn = database.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM definitions").fetchone() == (
+        sum(len(meaning["definitions"]) for meaning in hello_data[0]["meanings"]),
+    )
+
+
+def test_find_related(tmp_path, king):
+    king_data = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    path = tmp_path / "words.db"
+
+    # Words saved before the thesaurus existed are indexed by its migration
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE words (id INTEGER PRIMARY KEY, name TEXT, data JSON)"
+        )
+        conn.execute(
+            "INSERT INTO words (name, data) VALUES (?, ?)",
+            ("king", json.dumps(king_data[0])),
+        )
+    conn.close()
+
+    database = Database(path)
+    entries = database.find_related("Monarch")
+    assert [entry.headword for entry in entries] == ["king"]
+    assert entries[0].relationship_type == "synonyms"
+    assert database.find_related("monarch", "antonyms") == []
+
+    king_data[0]["meanings"][0]["definitions"][0]["related_words"] = []
+    database.edit_word(king_data)
+    queen_data = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    queen_data[0]["name"] = "queen"
+    database.save_word(queen_data)
+    assert [entry.headword for entry in database.find_related("monarch")] == ["queen"]
+
+    database.delete_word("queen")
+    assert database.find_related("monarch") == []
+    database.close_connection()
+
+
+def test_streaming_queries(hello):
+    database = Database(":memory:")
+    words = [
+        [{"name": name, "etymology": None, "pronunciations": [], "meanings": []}]
+        for name in ("delta", "alpha", "charlie", "bravo")
+    ]
+    database.save_words(words)
+
+    assert list(database.iter_names(batch_size=3)) == [
+        "alpha",
+        "bravo",
+        "charlie",
+        "delta",
+    ]
+    assert [word_data[0]["name"] for word_data in database.iter_words(1, 2)] == [
+        "bravo",
+        "charlie",
+    ]
+    assert len(list(database.iter_words(offset=3))) == 1
+    assert [len(batch) for batch in database.iter_in_batches(3)] == [3, 1]
+    assert sorted(
+        (word_data for batch in database.iter_in_batches(3) for word_data in batch),
+        key=lambda word_data: word_data[0]["name"],
+    ) == sorted(words, key=lambda word_data: word_data[0]["name"])
+
+    changes = list(database.iter_changed_since())
+    assert [name for _, _, name, _ in changes] == ["delta", "alpha", "charlie", "bravo"]
+    last_change = changes[-1][0]
+    assert list(database.iter_changed_since(last_change)) == []
+
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(hello))
+    database.edit_word([dict(words[1][0], etymology="Greek")])
+    assert [name for _, _, name, _ in database.iter_changed_since(last_change)] == [
+        "hello",
+        "alpha",
+    ]
+
+
+def test_changes_do_not_depend_on_the_clock(monkeypatch):
+    database = Database(":memory:")
+    word = {"name": "alpha", "etymology": None, "pronunciations": [], "meanings": []}
+    database.save_word([word])
+    ((last_change, *_),) = database.iter_changed_since()
+
+    # The clock stepped back: the words saved after are still reported
+    monkeypatch.setattr("english_dictionary.database.time", lambda: 0.0)
+    database.save_word([dict(word, name="bravo")])
+    database.edit_word([dict(word, etymology="Greek")])
+    assert [name for _, _, name, _ in database.iter_changed_since(last_change)] == [
+        "bravo",
+        "alpha",
+    ]
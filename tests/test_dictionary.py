@@ -1,6 +1,17 @@
 import pytest
 
-from english_dictionary.core import Dictionary, WordData, Definition, RelatedWord
+from english_dictionary.api import BaseAPIBuilder
+from english_dictionary.core import (
+    Dictionary,
+    WordData,
+    WordStub,
+    Definition,
+    Meaning,
+    RelatedWord,
+    ThesaurusEntry,
+)
+from english_dictionary.database import Database
+from .test_api import king
 
 
 @pytest.fixture
@@ -54,3 +65,226 @@ def test_dictionary():
 
     dictionary.remove(WordData("king"))
     assert dictionary.peek() == sorted(["ape", "zab", "ghana"])
+
+
+def test_dictionary_bulk_load():
+    dictionary = Dictionary()
+    king = WordData("king", etymology="existing")
+    dictionary.append(king)
+
+    dictionary.bulk_load(
+        [
+            WordData("zab"),
+            WordData("ape"),
+            WordData("king", etymology="new"),
+            WordData("ape"),
+            WordData("ghana"),
+        ]
+    )
+
+    assert dictionary.peek() == ["ape", "ghana", "king", "zab"]
+    assert dictionary.get_word_details("king") is king
+
+    with pytest.raises(ValueError):
+        dictionary.bulk_load(["not a word"])
+
+    # Loading in chunks keeps the indexes built so far up to date
+    assert dictionary.search_contains("an") == ["ghana"]
+    dictionary.bulk_load([WordData("zebra"), WordData("zanzibar")])
+    assert dictionary.peek() == ["ape", "ghana", "king", "zab", "zanzibar", "zebra"]
+    assert dictionary.search_contains("an") == ["ghana", "zanzibar"]
+    assert "zebra" in dictionary
+
+
+def test_dictionary_lookup_index(word):
+    dictionary = Dictionary()
+    dictionary.bulk_load([WordData("king"), WordData("ape")])
+    dictionary.append(word)
+
+    assert "hi" in dictionary
+    assert WordData("king") in dictionary
+    assert dictionary.get_word_details("hi") is word
+
+    new_word = WordData("hi", etymology="Somewhere")
+    dictionary.edit_word(word, new_word)
+    assert dictionary.get_word_details("hi") is new_word
+
+    dictionary.remove(WordData("king"))
+    assert "king" not in dictionary
+    with pytest.raises(KeyError):
+        dictionary.get_word_details("king")
+
+    assert dictionary.pop().get_name() == "hi"
+    assert "hi" not in dictionary
+
+    dictionary.clear()
+    assert "ape" not in dictionary
+    assert dictionary.peek() == []
+
+
+def test_dictionary_complete():
+    dictionary = Dictionary()
+    dictionary.bulk_load(
+        WordData(name) for name in ("kin", "king", "kingdom", "kind", "kit", "ape")
+    )
+
+    assert dictionary.complete("kin") == ["kin", "kind", "king", "kingdom"]
+    assert dictionary.complete("KIN", limit=2) == ["kin", "kind"]
+    assert dictionary.complete("a") == ["ape"]
+    assert dictionary.complete("z") == []
+    assert dictionary.complete("") == dictionary.peek()
+
+
+def test_dictionary_search_contains():
+    dictionary = Dictionary()
+    dictionary.bulk_load(
+        WordData(name) for name in ("king", "kingdom", "viking", "ok", "a", "mask")
+    )
+
+    assert dictionary.search_contains("king") == ["king", "kingdom", "viking"]
+    assert dictionary.search_contains("k") == [
+        "king",
+        "kingdom",
+        "mask",
+        "ok",
+        "viking",
+    ]
+    assert dictionary.search_contains("ki", limit=2) == ["king", "kingdom"]
+    assert dictionary.search_contains("A") == ["a", "mask"]
+    assert dictionary.search_contains("queen") == []
+
+    dictionary.append(WordData("smoking"))
+    dictionary.remove(WordData("viking"))
+    dictionary.edit_word(WordData("ok"), WordData("oak"))
+
+    assert dictionary.search_contains("king") == ["king", "kingdom", "smoking"]
+    assert dictionary.search_contains("ok") == ["smoking"]
+    assert dictionary.search_contains("oa") == ["oak"]
+
+
+def test_dictionary_suggest():
+    dictionary = Dictionary()
+    dictionary.bulk_load(
+        WordData(name) for name in ("monarch", "monarchy", "king", "ring", "sing")
+    )
+
+    assert dictionary.suggest("monarhc") == ["monarch", "monarchy"]
+    assert dictionary.suggest("kng", max_distance=1) == ["king"]
+    assert dictionary.suggest("xing", limit=2) == ["king", "ring"]
+    assert dictionary.suggest("queen") == []
+
+    dictionary.remove(WordData("ring"))
+    dictionary.append(WordData("wing"))
+    assert dictionary.suggest("xing") == ["king", "sing", "wing"]
+
+
+def test_dictionary_lazy_loading():
+    loaded_rows = []
+
+    def loader(row_id):
+        loaded_rows.append(row_id)
+        return [{"name": f"word{row_id}", "etymology": "Lazy", "meanings": []}]
+
+    dictionary = Dictionary(loader=loader, cache_size=2)
+    dictionary.bulk_load(WordStub(f"word{row_id}", row_id) for row_id in range(5))
+    assert loaded_rows == []
+
+    word = dictionary.get_word_details("word1")
+    assert word.etymology == "Lazy"
+    assert not isinstance(word, WordStub)
+    assert dictionary.get_word_details("word1") is word
+    assert loaded_rows == [1]
+
+    dictionary.get_word_details("word2")
+    dictionary.get_word_details("word3")
+    dictionary.get_word_details("word1")
+    assert loaded_rows == [1, 2, 3, 1]
+
+    edited = WordData("word3", etymology="Edited")
+    dictionary.edit_word(dictionary.get_word_details("word3"), edited)
+    assert dictionary.get_word_details("word3") is edited
+
+
+def test_dictionary_find_related():
+    def make_word(name, synonyms, antonyms=()):
+        related_words = [
+            RelatedWord("synonyms", list(synonyms)),
+            RelatedWord("antonyms", list(antonyms)),
+        ]
+        return WordData(
+            name,
+            meanings=[
+                Meaning("noun", [Definition("A word", related_words=related_words)])
+            ],
+        )
+
+    dictionary = Dictionary()
+    dictionary.bulk_load(
+        [make_word("king", ["Monarch", "ruler"]), make_word("queen", ["monarch"])]
+    )
+    dictionary.append(make_word("pauper", ["beggar"], antonyms=["monarch"]))
+
+    assert dictionary.find_related("monarch") == [
+        ThesaurusEntry("king", 0, 0, "synonyms"),
+        ThesaurusEntry("pauper", 0, 0, "antonyms"),
+        ThesaurusEntry("queen", 0, 0, "synonyms"),
+    ]
+    assert [
+        entry.headword for entry in dictionary.find_related("monarch", "synonyms")
+    ] == [
+        "king",
+        "queen",
+    ]
+
+    dictionary.edit_word(
+        dictionary.get_word_details("king"), make_word("king", ["ruler"])
+    )
+    dictionary.remove(dictionary.get_word_details("queen"))
+    assert dictionary.find_related("monarch") == [
+        ThesaurusEntry("pauper", 0, 0, "antonyms")
+    ]
+    assert dictionary.find_related("ruler")[0].headword == "king"
+    assert dictionary.find_related("missing") == []
+
+
+def test_dictionary_find_related_in_database(king):
+    database = Database(":memory:")
+    database.save_word(BaseAPIBuilder.from_free_dictionary_api(king))
+    dictionary = Dictionary(loader=database.fetch_word, thesaurus=database.find_related)
+    dictionary.bulk_load(
+        WordStub(name, row_id) for row_id, name in database.fetch_word_names()
+    )
+
+    # The words need not have been loaded
+    assert [entry.headword for entry in dictionary.find_related("Monarch")] == ["king"]
+
+    # The words loaded, added or edited are not indexed in memory too
+    queen = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    queen[0]["name"] = "queen"
+    dictionary.append(WordData.from_api(queen))
+    dictionary.edit_word(
+        dictionary.get_word_details("king"), WordData("king", etymology="Edited")
+    )
+    dictionary.clear()
+    assert dictionary._thesaurus is None
+
+
+def test_dictionary_revision(word):
+    dictionary = Dictionary()
+    dictionary.bulk_load([WordData("hello"), word])
+    revision = dictionary.revision("hi")
+    assert dictionary.revision("hello") == revision
+
+    dictionary.edit_word(word, WordData("hi", etymology="Edited"))
+    edited = dictionary.revision("hi")
+    assert edited != revision
+    assert dictionary.revision("hello") == revision
+
+    dictionary.remove(WordData("hi"))
+    dictionary.append(word)
+    assert dictionary.revision("hi") not in (revision, edited)
+
+    # Words loaded again are not taken for the words before
+    dictionary.clear()
+    dictionary.bulk_load([WordData("hello")])
+    assert dictionary.revision("hello") != revision
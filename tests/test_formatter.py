@@ -2,7 +2,11 @@ import pytest
 
 from english_dictionary.api import BaseAPIBuilder
 from english_dictionary.core import WordData
-from english_dictionary.utils.formatter import BaseAPIFormatter
+from english_dictionary.utils.formatter import (
+    BaseAPIFormatter,
+    RenderCache,
+    render_word,
+)
 from .test_api import king
 
 
@@ -39,3 +43,22 @@ def test_parse_pronunciations(formatter_instance):
 #         "make (someone) king.\n\n act in an unpleasantly superior and domineering way.\n\n \n\n <b>Example:</b> "
 #         "he'll start kinging it over the lot of us again ".strip()
 #     )
+
+
+def test_render_cache(king):
+    word = WordData.from_api(BaseAPIBuilder.from_free_dictionary_api(king))
+    html = render_word(word)
+    assert html.startswith("<b style='font-size: 40px'>King</b><hr />")
+
+    cache = RenderCache(maxsize=2)
+    cache.put("king", 1, html)
+    assert cache.get("king", 1) == html
+    # Pages of other revisions of the word are not returned
+    assert cache.get("king", 2) is None
+
+    cache.put("queen", 1, "queen")
+    cache.put("prince", 1, "prince")
+    assert "king" not in cache and len(cache) == 2
+
+    cache.discard("queen")
+    assert cache.get("queen", 1) is None
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from english_dictionary.api import BaseAPIBuilder
+from english_dictionary.database import Database
+from english_dictionary.gui import components
+from .test_api import king
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def window(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(components, "DATABASE_DIRECTORY", tmp_path)
+    window = components.MainWindow()
+    window.word_loader.wait()
+    app.processEvents()
+
+    yield window
+
+    window.close()
+
+
+def test_adding_a_stored_word(window, tmp_path, monkeypatch, king):
+    king_data = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    assert window.store_word(king_data)
+    window.select_word("king")
+    assert "Germanic origin" in window.text_browser.toPlainText()
+
+    edited = BaseAPIBuilder.from_free_dictionary_api(king)[:1]
+    edited[0]["etymology"] = "Of Saxon origin"
+
+    # The stored word is only replaced once confirmed
+    monkeypatch.setattr(
+        components.QMessageBox, "question", lambda *args: components.QMessageBox.No
+    )
+    assert not window.store_word(edited)
+    assert "Germanic origin" in window.text_browser.toPlainText()
+
+    monkeypatch.setattr(
+        components.QMessageBox, "question", lambda *args: components.QMessageBox.Yes
+    )
+    assert window.store_word(edited)
+    assert window.current_word() == "king"
+    assert "Saxon origin" in window.text_browser.toPlainText()
+    assert window.dictionary.get_word_details("king").etymology == "Of Saxon origin"
+    database = Database(tmp_path / components.DATABASE_NAME)
+    assert list(database.fetch_all_words()) == [edited]
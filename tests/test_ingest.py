@@ -0,0 +1,146 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from english_dictionary.codec import BinaryCodec, decode_entry
+from english_dictionary.database import Database
+from english_dictionary.ingest import ingest, iter_dump, iter_json_array, transform
+from english_dictionary.run import main
+from .test_api import hello, king
+
+
+@pytest.fixture
+def database():
+    return Database(":memory:")
+
+
+@pytest.fixture
+def entries(king, hello):
+    """FreeDictionaryAPI responses, or single words of responses"""
+    return [king, hello[0], {"word": "broken", "meanings": None}]
+
+
+def test_iter_json_array():
+    elements = [{"a": '[not] the end, "quoted"'}, [1, [2, {}]], "]", 1234, None]
+    text = " [\n" + ",\n ".join(json.dumps(element) for element in elements) + "\n]\n"
+
+    # Elements are read across chunks of any size
+    for read_size in (1, 7, 1000):
+        assert [
+            json.loads(element)
+            for element in iter_json_array(io.StringIO(text), read_size)
+        ] == elements
+
+    assert list(iter_json_array(io.StringIO("[]"))) == []
+
+    for invalid in ("", '{"a": 1}', "[1 2]", "[1, 2", '[{"a": 1]', '[1, "2]'):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(invalid), read_size=2))
+
+
+def test_iter_json_array_malformed_elements():
+    malformed = ['{"a": [1, 2}, "b": "]"}', "nul", '{"a": 1,}', ""]
+    elements = ['{"a": 1}'] + malformed + ["[2]", " " * 10**5 + "3"]
+    text = "[" + ", ".join(elements) + "]"
+
+    # Malformed elements are skipped over, without reading the rest of the array
+    for read_size in (1, 7, 1000):
+        file = io.StringIO(text)
+        elements = iter_json_array(file, read_size)
+        assert [next(elements) for _ in range(len(malformed) + 2)] == (
+            ['{"a": 1}'] + malformed + ["[2]"]
+        )
+        assert file.tell() < 10**4
+
+
+@pytest.mark.parametrize(
+    "unclosed",
+    ['{"a": [1, {"b": "' + "x" * 1000 + '"}}', '{"a": "' + "x" * 1000 + "}"],
+    ids=["bracket", "string"],
+)
+def test_iter_json_array_unclosed_elements(unclosed):
+    # Cut short when too long, then the array is read again from the next element
+    for read_size in (7, 1000):
+        text = "[" + ", ".join(['{"a": 1}', unclosed, '{"c": 2}', "[3]"]) + "]"
+        elements = list(iter_json_array(io.StringIO(text), read_size, 100))
+        assert elements[0] == '{"a": 1}' and elements[-2:] == ['{"c": 2}', "[3]"]
+        assert elements[1] == unclosed[:100]
+        assert all(len(element) <= 100 for element in elements)
+
+        # The last element (the parts of it looking like elements are yielded too)
+        text = '[{"a": 1}, ' + unclosed + "\n]\n"
+        elements = list(iter_json_array(io.StringIO(text), read_size, 100))
+        assert elements[:2] == ['{"a": 1}', unclosed[:100]]
+
+        # The dump is cut short
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text[:-3]), read_size, 100))
+
+
+def test_iter_dump(tmp_path, entries):
+    jsonl = tmp_path / "dump.jsonl.gz"
+    with gzip.open(jsonl, "wt", encoding="utf-8") as file:
+        file.writelines(json.dumps(entry) + "\n\n" for entry in entries)
+
+    array = tmp_path / "dump.json"
+    array.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+
+    for path in (jsonl, array):
+        assert [json.loads(record) for record in iter_dump(path)] == entries
+
+
+def test_transform(entries):
+    records = [json.dumps(entry) for entry in entries]
+    words, encoded, count, invalid, rss = transform(records, BinaryCodec())
+
+    assert [word_data[0]["name"] for word_data in words] == [
+        "king",
+        "God Save the Queen",
+        "hello",
+    ]
+    assert [decode_entry(data) for data in encoded] == [
+        word_data[0] for word_data in words
+    ]
+    assert (count, invalid) == (3, 1)
+    assert rss is None or rss > 0
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_ingest(tmp_path, database, entries, workers):
+    path = tmp_path / "dump.jsonl"
+    path.write_text(
+        "".join(json.dumps(entry) + "\n" for entry in entries * 3), encoding="utf-8"
+    )
+    reports = []
+
+    report = ingest(
+        path,
+        database,
+        workers=workers,
+        chunk_size=2,
+        batch_size=2,
+        progress=reports.append,
+    )
+
+    assert (report.entries, report.invalid) == (9, 3)
+    assert reports[-1] is report and len(reports) >= 4
+    assert report.peak_rss is None or report.peak_rss > 0
+    assert sorted(database.iter_names()) == ["God Save the Queen", "hello", "king"]
+    assert report.words >= database.count_words() == 3
+    assert [entry.headword for entry in database.find_related("monarch")] == ["king"]
+
+
+def test_ingest_command(tmp_path, entries, capsys):
+    dump = tmp_path / "dump.json"
+    # A malformed entry is counted as invalid, and the entries after it are still saved
+    dump.write_text(
+        json.dumps(entries).replace("[", '[{"word": "bad",}, ', 1), encoding="utf-8"
+    )
+    path = tmp_path / "words.db"
+
+    main(["ingest", str(dump), "--workers", "0", "--database", str(path)])
+
+    assert "4 entries (2 invalid), 3 words saved" in capsys.readouterr().out
+    assert Database(path).count_words() == 3
@@ -0,0 +1,93 @@
+import pytest
+
+from english_dictionary.api import LookupClient
+from english_dictionary.database import Database
+from english_dictionary.prefetch import prefetch, read_word_list
+from english_dictionary.run import main
+from .test_api import dictionary_server, hello, king, wiktionary_dump
+
+
+@pytest.fixture
+def word_list(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("# Seed words\nKing\n\nhello\nmissing\nking\n", encoding="utf-8")
+    return path
+
+
+def test_read_word_list(word_list):
+    assert read_word_list(word_list) == ["king", "hello", "missing"]
+
+
+def test_prefetch(dictionary_server, word_list):
+    database = Database(":memory:")
+    reports = []
+
+    with LookupClient(max_workers=2, base_url=dictionary_server.url) as client:
+        report = prefetch(
+            read_word_list(word_list),
+            database,
+            client,
+            batch_size=1,
+            progress=reports.append,
+        )
+
+    assert (report.fetched, report.not_found, report.failed, report.skipped) == (
+        2,
+        1,
+        [],
+        0,
+    )
+    assert list(database.iter_names()) == ["hello", "king"]
+    assert reports[-1] is report and len(reports) >= 2
+
+    # Words already stored are not fetched again
+    with LookupClient(base_url=dictionary_server.url) as client:
+        report = prefetch(["hello", "king", "missing"], database, client)
+
+    assert (report.fetched, report.not_found, report.skipped) == (0, 1, 2)
+    assert sorted(dictionary_server.requests) == ["hello", "king", "missing", "missing"]
+
+
+def test_prefetch_command(dictionary_server, word_list, tmp_path, capsys):
+    path = tmp_path / "words.db"
+    main(
+        [
+            "prefetch",
+            str(word_list),
+            "--concurrency",
+            "4",
+            "--database",
+            str(path),
+            "--base-url",
+            dictionary_server.url,
+        ]
+    )
+
+    assert "2 fetched, 1 not found, 0 failed" in capsys.readouterr().out
+    assert list(Database(path).iter_names()) == ["hello", "king"]
+
+
+def test_prefetch_from_wiktionary_dump(
+    dictionary_server, word_list, wiktionary_dump, tmp_path, capsys
+):
+    path = tmp_path / "words.db"
+    main(
+        [
+            "prefetch",
+            str(word_list),
+            "--database",
+            str(path),
+            "--base-url",
+            dictionary_server.url,
+            "--wiktionary-dump",
+            str(wiktionary_dump),
+        ]
+    )
+
+    assert "2 fetched, 1 not found, 0 failed" in capsys.readouterr().out
+    # king comes from the dump, and is not requested from FreeDictionaryAPI
+    assert sorted(dictionary_server.requests) == ["hello", "missing"]
+    (king,) = [
+        word for (word,) in Database(path).fetch_all_words() if word["name"] == "king"
+    ]
+    assert king["etymology"] == "From Old English cyning."
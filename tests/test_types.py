@@ -1,6 +1,16 @@
+import random
+from sys import intern
+
 import pytest
 
-from english_dictionary.core import OrderedList, WordData
+from english_dictionary.core import (
+    BlockStore,
+    Definition,
+    ListStore,
+    OrderedList,
+    RelatedWord,
+    WordData,
+)
 
 
 def test_ordered_list_no_duplicates():
@@ -68,3 +78,116 @@ def test_word_data():
     word = WordData("hi")
 
     assert str(word) == "hi"
+
+
+@pytest.mark.parametrize(
+    "storage",
+    [ListStore, lambda: BlockStore(load=2), lambda: BlockStore(load=5)],
+)
+def test_ordered_list_storage(storage):
+    random.seed(0)
+    ordered_list = OrderedList(allow_duplicates=True, storage=storage)
+    expected = []
+
+    for _ in range(500):
+        if expected and random.random() < 0.3:
+            index = random.randrange(-len(expected), len(expected))
+            assert ordered_list.pop(index) == expected.pop(index)
+        else:
+            item = random.randint(0, 50)
+            ordered_list.append(item)
+            expected.append(item)
+            expected.sort()
+
+        assert ordered_list.peek() == expected
+        assert len(ordered_list) == len(expected)
+
+    assert ordered_list.index(expected[10]) == [
+        i for i, item in enumerate(expected) if item == expected[10]
+    ]
+    ordered_list.remove(expected[10])
+    assert len(ordered_list) == len(expected) - 1
+
+
+def test_block_store_positions():
+    store = BlockStore(load=3)
+
+    for item in range(100, 0, -1):
+        store.add(item)
+
+    assert store[0] == 1
+    assert store[-1] == 100
+    assert store[40:45] == [41, 42, 43, 44, 45]
+    assert list(store.islice(95)) == [96, 97, 98, 99, 100]
+    assert store.bisect_left(50) == 49
+    assert store.bisect_right(50) == 50
+
+    with pytest.raises(IndexError):
+        store[100]
+
+
+def test_ordered_list_extend_sorted():
+    no_duplicates = OrderedList(allow_duplicates=False)
+    no_duplicates.append(5)
+    no_duplicates.extend_sorted([9, 1, 5, 3, 1, 7])
+    assert no_duplicates.peek() == [1, 3, 5, 7, 9]
+
+    duplicates = OrderedList(allow_duplicates=True)
+    duplicates.append(5)
+    duplicates.extend_sorted([9, 1, 5, 3, 1])
+    assert duplicates.peek() == [1, 1, 3, 5, 5, 9]
+    assert duplicates.index(5) == [3, 4]
+
+
+@pytest.mark.parametrize("storage", [ListStore, lambda: BlockStore(load=4)])
+def test_ordered_list_extend_sorted_in_chunks(storage):
+    ordered_list = OrderedList(storage=storage)
+
+    # Chunks sorting after the current items are appended, the others merged
+    for chunk in ([3, 1, 2], [4, 4, 5, 6, 7, 8, 9, 10, 11], [12], [0, 13]):
+        ordered_list.extend_sorted(chunk)
+
+    assert ordered_list.peek() == list(range(14))
+    assert ordered_list[9] == 9
+    assert ordered_list.insertion_index(4) == 4
+    ordered_list.append(14)
+    assert ordered_list[-1] == 14
+
+
+def test_word_data_is_compact():
+    word = WordData.from_api(
+        [
+            {
+                "name": "hi",
+                "meanings": [
+                    {
+                        "part_of_speech": "".join(["no", "un"]),
+                        "definitions": [
+                            {
+                                "definition": "A greeting",
+                                "related_words": [
+                                    {
+                                        "relationship_type": "".join(["syn", "onyms"]),
+                                        "words": ["hello"],
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            }
+        ]
+    )
+    meaning = word.meanings[0]
+    definition = meaning.definitions[0]
+    related_word = definition.related_words[0]
+
+    for instance in (word, meaning, definition, related_word):
+        assert not hasattr(instance, "__dict__")
+
+    assert meaning.part_of_speech is intern("noun")
+    assert related_word.relationship_type is intern("synonyms")
+    assert definition == Definition(
+        definition="A greeting",
+        related_words=[RelatedWord("synonyms", ["hello"])],
+    )